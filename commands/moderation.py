@@ -1,5 +1,3 @@
-from datetime import datetime, timezone, timedelta
-
 import discord
 from discord import Option, slash_command
 from discord.ext.commands import Cog
@@ -76,7 +74,7 @@ class Moderation(Cog):
         """Remove a single log entry from a user"""
         guild = await self.guilds.get(ctx.guild_id)
 
-        num_removed = guild.log.remove(predicate=lambda entry: entry["id"] == id)
+        num_removed = guild.log.remove_id(id)
 
         if num_removed > 0:
             await ctx.respond("Entry removed", ephemeral=True)
@@ -91,7 +89,7 @@ class Moderation(Cog):
         """Remove everything in the log for a user"""
         guild = await self.guilds.get(ctx.guild_id)
 
-        num_removed = guild.log.remove(predicate=lambda entry: entry["user"] == name.id)
+        num_removed = guild.log.remove_user(name.id)
 
         if num_removed > 0:
             await (await guild.fetch_mod_channel()).send(f"{ctx.author.mention} purged the log of {name.mention}.")
@@ -133,10 +131,7 @@ class Moderation(Cog):
                         ):
         """Display the list of all users that have warnings."""
         guild = await self.guilds.get(ctx.guild_id)
-        entries = guild.log.print_warning_top(recent=(sorting == "recent"))
-
-        if limit > 0:
-            entries = entries[0:limit]
+        entries = guild.log.print_warning_top(recent=(sorting == "recent"), limit=limit)
 
         await scrimbot.utils.print(ctx, "", entries, f"**Warning top**\n *(all time/recent)*")
 
@@ -150,16 +145,6 @@ class Moderation(Cog):
         """Display the list of all users that played scrims"""
         guild = await self.guilds.get(ctx.guild_id)
 
-        start_time = datetime.min
-
-        if period == "Week":
-            start_time = datetime.now(timezone.utc) - timedelta(weeks=1)
-        elif period == "Month":
-            start_time = datetime.now(timezone.utc).replace(day=1) - timedelta(days=1)
-
-        entries = guild.log.print_scrim_top(start_time)
-
-        if limit > 0:
-            entries = entries[0:limit]
+        entries = guild.log.print_scrim_top(period, limit=limit)
 
         await scrimbot.utils.print(ctx, "", entries, f"**Scrim top** ({period})", ephemeral=(ephemeral == "Yes"))
@@ -124,11 +124,8 @@ class Scrim(Cog):
         """Get a list of active scrims that haven't started yet (10 max)"""
         guild = await self.guilds.get(ctx.guild_id)
 
-        scrims: list[scrimbot.ScrimManager] = guild.scrim_managers
         relevant_scrims: list[scrimbot.ScrimManager] = \
-            list([s for s in scrims if s.scrim.time >= datetime.now(timezone.utc)])
-        relevant_scrims.sort(key=lambda s: s.scrim.time)
-        relevant_scrims = relevant_scrims[:10]
+            guild.scrim_managers.between(start=datetime.now(timezone.utc).timestamp())[:10]
 
         if len(relevant_scrims) == 0:
             await ctx.respond("No scrims currently active", ephemeral=True)
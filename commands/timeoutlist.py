@@ -7,7 +7,7 @@ from discord import Option, Permissions
 from discord.ext.commands import Cog
 
 import scrimbot
-from scrimbot import Guilds
+from scrimbot import Guilds, tag
 
 _log = logging.getLogger(__name__)
 
@@ -29,13 +29,9 @@ class TimeoutList(Cog):
         guild = await self.guilds.get(ctx.guild_id)
 
         users = []
-        if user is None:
-            for member in ctx.guild.members:
-                if guild.is_on_timeout(member):
-                    users.append((member, guild.get_user_timeout(member.id)))
-        else:
-            if guild.is_on_timeout(user):
-                users.append((user, guild.get_user_timeout(user.id)))
+        for user_id, delta in guild.timeout_list(None if user is None else user.id):
+            member = ctx.guild.get_member(user_id)
+            users.append((tag.user(user_id) if member is None else member, delta))
 
         if not users:
             if user is None:
@@ -23,8 +23,14 @@ intents.message_content = True
 
 bot = discord.Bot(intents=intents)
 
+config = Config()
+bot.storage = config.storage
+
 guilds = scrimbot.Guilds(bot)
 
+bot.scheduler = scrimbot.Scheduler(bot.loop.create_task)
+bot.rate_limiter = scrimbot.RateLimiter(bot.loop.create_task)
+
 oculus_profiles = scrimbot.OculusProfiles(bot, guilds=guilds)
 bot.oculus_profiles = oculus_profiles
 bot.initialised = False
@@ -32,20 +38,12 @@ bot.initialised = False
 _log = logging.getLogger("scrimbot")
 
 
-async def init():
-    for guild in guilds.values():
-        try:
-            await guild.init()
-        except Exception as error:
-            _log.error(f"Unable to properly initialise guild {guild.name} due to {error}")
-            _log.exception(error)
-
-
 @bot.event
 async def on_ready():
     if not bot.initialised:
         bot.initialised = True
         _log.info("Bot initialised")
+        bot.loop.create_task(guilds.warm_up())
 
 
 @bot.slash_command()
@@ -65,8 +63,7 @@ async def time(ctx):
 
 @bot.event
 async def on_member_update(before, after):
-    guild = await guilds.get(after.guild.id)
-    guild.on_member_update(before, after)
+    guilds.on_member_update(before, after)
 
 
 bot.add_cog(commands.Moderation(guilds))
@@ -75,4 +72,7 @@ bot.add_cog(commands.Oculus(guilds, oculus_profiles))
 bot.add_cog(commands.TimeoutList(guilds))
 bot.add_cog(commands.Settings(guilds))
 
-bot.run(Config().token)
+bot.run(config.token)
+
+guilds.flush()
+oculus_profiles.flush()
@@ -1,10 +1,19 @@
 from scrimbot.utils import *
 from scrimbot.store import Store
+from scrimbot.journal import Journal
 from scrimbot.log import Log
+from scrimbot.database import Database, SqliteStore, SqliteLog
 from scrimbot.settings import Settings
 from scrimbot.discordProxy import DiscordProxy
+from scrimbot.debouncer import Debouncer
+from scrimbot.scheduler import Scheduler, ScheduledEvent
+from scrimbot.ratelimiter import RateLimiter, TokenBucket
+from scrimbot.rolequeue import RoleQueue
+from scrimbot.roster import Roster
 from scrimbot.scrim import Scrim
 from scrimbot.scrimmanager import ScrimManager
+from scrimbot.scrimregistry import ScrimRegistry
+from scrimbot.playerindex import PlayerIndex
 from scrimbot.guild import Guild
 from scrimbot.guilds import Guilds
 from scrimbot.config import Config
@@ -1,4 +1,8 @@
+import os
+
+
 class Config:
     def __init__(self):
         with open('data/bot.token', 'r') as file:
             self.token = file.read().strip()
+        self.storage = os.environ.get("SCRIMBOT_STORAGE", "json")
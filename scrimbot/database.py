@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Optional, Any
+
+import scrimbot
+
+_log = logging.getLogger(__name__)
+
+
+class Database:
+    """SQLite file holding the log, scrims and timeouts of a single guild. The connection is shared by the stores
+    writing from worker threads and the log on the event loop, `lock` serialises access to it."""
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS log (id TEXT PRIMARY KEY, user INTEGER, author INTEGER, type TEXT, time REAL, "
+        "channel INTEGER, text TEXT)",
+        "CREATE INDEX IF NOT EXISTS log_user ON log (type, user, time)",
+        "CREATE INDEX IF NOT EXISTS log_author ON log (type, author, time)",
+        "CREATE INDEX IF NOT EXISTS log_time ON log (type, time)",
+        "CREATE TABLE IF NOT EXISTS scrims (thread INTEGER PRIMARY KEY, time REAL, data TEXT)",
+        "CREATE INDEX IF NOT EXISTS scrims_time ON scrims (time)",
+        "CREATE TABLE IF NOT EXISTS timeouts (user_id INTEGER PRIMARY KEY, timeout REAL, data TEXT)",
+        "CREATE INDEX IF NOT EXISTS timeouts_timeout ON timeouts (timeout)",
+    ]
+
+    def __init__(self, file: str):
+        self.file = file
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(file, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in Database.SCHEMA:
+                self.connection.execute(statement)
+
+    @classmethod
+    def for_guild(cls, guild_id: str, directory: str = "data") -> "Database":
+        file = os.path.join(directory, f"{guild_id}.sqlite3")
+        if os.path.exists(file):
+            return cls(file)
+        return migrate(guild_id, directory)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def execute(self, sql: str, parameters=()) -> list[sqlite3.Row]:
+        with self.lock, self.connection:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def executemany(self, sql: str, parameters):
+        with self.lock, self.connection:
+            self.connection.executemany(sql, parameters)
+
+
+class SqliteStore(scrimbot.Store[list]):
+    """Store for a list of dicts kept as one row per item in `table`, keyed by `key` and indexed by `time`. Only rows
+    that changed since the last write are written."""
+
+    def __init__(self, database: Database, table: str, key: str, time: str, queue_task: Optional[Callable] = None,
+                 interval: float = 2.0):
+        self.__database = database
+        self.__table = table
+        self.__key = key
+        self.__time = time
+        self.__rows: dict[int, str] = {}
+        super().__init__(database.file, [], queue_task=queue_task, interval=interval)
+
+    def _load(self) -> list:
+        rows = self.__database.execute(f"SELECT {self.__key}, data FROM {self.__table} ORDER BY {self.__time}")
+        self.__rows = {r[self.__key]: r["data"] for r in rows}
+        return [json.loads(r["data"]) for r in rows]
+
+    def _serialize(self) -> Any:
+        return {item[self.__key]: (item[self.__time], json.dumps(item)) for item in self.data}
+
+    def _write(self, content: Any):
+        changed = [(k, t, d) for k, (t, d) in content.items() if self.__rows.get(k) != d]
+        removed = [(k,) for k in self.__rows.keys() - content.keys()]
+
+        with self.__database.lock, self.__database.connection as connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {self.__table} ({self.__key}, {self.__time}, data) VALUES (?, ?, ?)", changed)
+            connection.executemany(f"DELETE FROM {self.__table} WHERE {self.__key} = ?", removed)
+
+        self.__rows = {k: d for k, (t, d) in content.items()}
+
+
+class SqliteLog:
+    """Log kept in the `log` table, counts and top lists are answered by indexed queries so nothing is kept in
+    memory."""
+
+    ALL = scrimbot.Log.ALL
+
+    def __init__(self, database: Database, get_user: Callable[[int], dict]):
+        self.__database = database
+        self.__get_user = get_user
+
+    def add_note(self, user: int, author: int, text: str):
+        self.__add_entry("note", user, author, text)
+
+    def add_warning(self, user: int, author: int, text: str):
+        self.__add_entry("warning", user, author, text)
+
+    def add_report(self, channel: int, user: int, author: int, text: str):
+        self.__add_entry("report", user, author, text, channel=channel)
+
+    def add_kick(self, channel: int, user: int, author: int, text: str):
+        self.__add_entry("scrim-kick", user, author, text, channel=channel)
+
+    def add_timeout(self, user: int, author: int, text: str):
+        self.__add_entry("timeout", user, author, text)
+
+    def add_scrim(self, user: int, text: str):
+        self.__add_entry("scrim", user, 0, text)
+
+    def __add_entry(self, type: str, user: int, author: int, text: str, channel: Optional[int] = None):
+        insert_entries(self.__database, [{
+            "id": uuid.uuid4().hex[0:16],
+            "user": user,
+            "time": datetime.now(timezone.utc).timestamp(),
+            "text": text,
+            "author": author,
+            "type": type,
+            "channel": channel}])
+
+    def __count(self, type: str, column: str, user: int, start_time: float = 0) -> int:
+        return self.__database.execute(
+            f"SELECT COUNT(*) FROM log WHERE type = ? AND {column} = ? AND time > ?", (type, user, start_time))[0][0]
+
+    def warning_count(self, user: int) -> int:
+        return self.__count("warning", "user", user)
+
+    def weekly_warning_count(self, user: int) -> int:
+        start_time = (datetime.now(timezone.utc) - timedelta(days=7)).timestamp()
+        return self.__count("warning", "user", user, start_time)
+
+    def scrim_count(self, user: int, start_time=datetime.min) -> int:
+        timestamp = 0 if start_time == datetime.min else start_time.timestamp()
+        return self.__count("scrim", "user", user, timestamp)
+
+    def daily_report_count(self, user: int) -> int:
+        start_time = (datetime.now(timezone.utc) - timedelta(days=1)).timestamp()
+        return self.__count("report", "author", user, start_time)
+
+    def remove(self, predicate) -> int:
+        ids = [(e["id"],) for e in map(_entry, self.__database.execute("SELECT * FROM log")) if predicate(e)]
+        if len(ids) > 0:
+            self.__database.executemany("DELETE FROM log WHERE id = ?", ids)
+        return len(ids)
+
+    def remove_id(self, id: str) -> int:
+        with self.__database.lock, self.__database.connection as connection:
+            return connection.execute("DELETE FROM log WHERE id = ?", (id,)).rowcount
+
+    def remove_user(self, user: int) -> int:
+        with self.__database.lock, self.__database.connection as connection:
+            return connection.execute("DELETE FROM log WHERE user = ?", (user,)).rowcount
+
+    def print_log(self, user: int, types=None, authors=False) -> list:
+        if types is None:
+            types = ["warning"]
+
+        placeholders = ", ".join("?" * len(types))
+        rows = self.__database.execute(
+            f"SELECT * FROM log WHERE type IN ({placeholders}) AND user = ? "
+            f"UNION SELECT * FROM log WHERE type IN ({placeholders}) AND author = ? ORDER BY time",
+            (*types, user, *types, user))
+
+        output = []
+        for entry in map(_entry, rows):
+            line = scrimbot.Log.format_entry(entry, user, authors)
+            if line is not None:
+                output.append(line)
+
+        return output
+
+    def print_warning_top(self, recent=False, limit=0) -> list:
+        selected = "recents" if recent else "warns"
+        start_time = (datetime.now(timezone.utc) - timedelta(days=7)).timestamp()
+
+        rows = self.__database.execute(
+            f"SELECT user, COUNT(*) AS warns, SUM(time > ?) AS recents FROM log WHERE type = 'warning' "
+            f"GROUP BY user ORDER BY {selected} DESC LIMIT ?", (start_time, limit if limit > 0 else -1))
+        return [f"<@{r['user']}> {r['warns']}/{r['recents']}" for r in rows]
+
+    def print_scrim_top(self, period="All", limit=0) -> list:
+        timestamp = scrimbot.log.period_start(period)
+
+        rows = self.__database.execute(
+            "SELECT user, SUM(time > ?) AS scrims FROM log WHERE type = 'scrim' GROUP BY user ORDER BY scrims DESC "
+            "LIMIT ?", (timestamp, limit if limit > 0 else -1))
+        return [f"<@{r['user']}> {self.__get_user(r['user']).get('name', '')} {r['scrims']}" for r in rows]
+
+
+def _entry(row: sqlite3.Row) -> dict:
+    entry = dict(row)
+    if entry["channel"] is None:
+        del entry["channel"]
+    return entry
+
+
+def insert_entries(database: Database, entries: list[dict]):
+    database.executemany(
+        "INSERT OR REPLACE INTO log (id, user, author, type, time, channel, text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(e["id"], e["user"], e["author"], e["type"], e["time"], e.get("channel", None), e["text"]) for e in entries])
+
+
+def migrate(guild_id: str, directory: str = "data") -> Database:
+    """Create the database of a guild from its JSON files, which are renamed to `.migrated` afterwards. The database is
+    built in a temporary file and only moved into place once everything is in, a failed migration is tried again on the
+    next load."""
+    file = os.path.join(directory, f"{guild_id}.sqlite3")
+    temp_file = f"{file}.tmp"
+    for leftover in [temp_file, f"{temp_file}-wal", f"{temp_file}-shm"]:
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+    database = Database(temp_file)
+    _log.info(f"Migrating guild {guild_id} to {file}")
+
+    log_file = os.path.join(directory, f"{guild_id}-log.jsonl")
+    legacy_log_file = os.path.join(directory, f"{guild_id}-log.json")
+    migrated = []
+    try:
+        if os.path.exists(log_file) or os.path.exists(legacy_log_file):
+            insert_entries(database, list(scrimbot.Journal(log_file, legacy_file=legacy_log_file).entries.values()))
+            # An unreadable legacy log is renamed to `.bad` by the journal, leaving no log file behind
+            migrated.append(log_file)
+
+        for table, key, time in [("scrims", "thread", "time"), ("timeouts", "user_id", "timeout")]:
+            table_file = os.path.join(directory, f"{guild_id}-{table}.json")
+            if os.path.exists(table_file):
+                store = SqliteStore(database, table, key, time)
+                store.data = scrimbot.Store[list](table_file, []).data
+                store.sync()
+                migrated.append(table_file)
+    finally:
+        # Closing checkpoints the write-ahead log into the file itself
+        database.close()
+
+    os.replace(temp_file, file)
+    for source in migrated:
+        if os.path.exists(source):
+            os.rename(source, f"{source}.migrated")
+
+    return Database(file)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for guild_id in scrimbot.guilds.known_guild_ids():
+        Database.for_guild(guild_id)
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Coroutine, Any, Optional
+
+_log = logging.getLogger(__name__)
+
+
+class Debouncer:
+    """Runs `action` when requested, at most once per `interval` seconds. Requests that come in while a run is waiting
+    or in progress are merged into the next run, so the last request is always followed by a complete run."""
+
+    def __init__(self, action: Callable[[], Coroutine[Any, Any, Any]], queue_task: Callable, interval: float = 2.0):
+        self.__action = action
+        self.__queue_task = queue_task
+        self.__interval = interval
+        self.__pending = False
+        self.__task: Optional[asyncio.Task] = None
+        self.__last_run = -math.inf
+        self.requested = 0
+        self.performed = 0
+
+    def request(self):
+        self.requested += 1
+        self.__pending = True
+        if self.__task is None:
+            self.__task = self.__queue_task(self.__run())
+
+    async def __run(self):
+        try:
+            while self.__pending:
+                wait = self.__last_run + self.__interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                self.__pending = False
+                self.__last_run = time.monotonic()
+                self.performed += 1
+                try:
+                    await self.__action()
+                except Exception as error:
+                    _log.error(f"Unable to run {self.__action} due to {error}")
+                    _log.exception(error)
+        finally:
+            self.__task = None
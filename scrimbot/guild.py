@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from datetime import timedelta
+from datetime import timedelta, datetime, timezone
 from typing import Optional, Callable, Coroutine, Any
 
 import discord
@@ -12,6 +12,7 @@ _log = logging.getLogger(__name__)
 
 
 class Guild:
+    RECONCILE_INTERVAL = timedelta(hours=1)
 
     def __init__(self, id: str, bot: discord.Bot):
         self.id = str(id)
@@ -22,19 +23,32 @@ class Guild:
             scrimbot.Store[dict](f"data/{self.id}-settings.json", scrimbot.Settings.DEFAULT),
             lambda: set([x.id for x in self.discord_guild.channels]),
             lambda: set([x.id for x in self.discord_guild.roles]))
-        __log_store = scrimbot.Store[list](f"data/{self.id}-log.json", [])
-        self.__scrims = scrimbot.Store[list](f"data/{self.id}-scrims.json", [])
-        _timeouts_store = scrimbot.Store[list](f"data/{self.id}-timeouts.json", [])
-        self.log = scrimbot.Log(__log_store.data, self.queue_callable(__log_store.sync),
-                                bot.oculus_profiles.get_profile_by_id)
-        self._timeouts = scrimbot.TimeoutList(self, _timeouts_store)
+        if self.bot.storage == "sqlite":
+            database = scrimbot.Database.for_guild(self.id)
+            self.__scrims = scrimbot.SqliteStore(database, "scrims", "thread", "time", queue_task=self.queue_task)
+            self.__timeouts_store = scrimbot.SqliteStore(database, "timeouts", "user_id", "timeout",
+                                                         queue_task=self.queue_task)
+            self.log = scrimbot.SqliteLog(database, bot.oculus_profiles.get_profile_by_id)
+            self.__stores = [self.__scrims, self.__timeouts_store]
+        else:
+            log_journal = scrimbot.Journal(f"data/{self.id}-log.jsonl", legacy_file=f"data/{self.id}-log.json",
+                                           queue_task=self.queue_task)
+            self.__scrims = scrimbot.Store[list](f"data/{self.id}-scrims.json", [], queue_task=self.queue_task)
+            self.__timeouts_store = scrimbot.Store[list](f"data/{self.id}-timeouts.json", [],
+                                                         queue_task=self.queue_task)
+            self.log = scrimbot.Log(log_journal, bot.oculus_profiles.get_profile_by_id)
+            self.__stores = [log_journal, self.__scrims, self.__timeouts_store]
+        self._timeouts = scrimbot.TimeoutList(self, self.__timeouts_store)
         self.mod_channel: Optional[discord.TextChannel] = None
-        self.scrim_managers: list[scrimbot.ScrimManager] = []
+        self.scrim_managers = scrimbot.ScrimRegistry(self.__scrims.data)
         self.broadcasts: list[scrimbot.Broadcaster] = []
         self.__invite_channel: Optional[discord.TextChannel] = None
         self.__timeout_role = self.settings.server.get("timeout_role", None)
+        self.__timeout_role_holders: set[int] = set()
+        self.__role_edits = scrimbot.RoleQueue(lambda: self.bot.get_guild(int(self.id)), self.queue_task)
+        self.__reconcile_event: Optional[scrimbot.ScheduledEvent] = None
 
-        for scrim in self.__scrims.data:
+        for scrim in list(self.__scrims.data):
             self.__create_scrim(scrim)
 
     @property
@@ -46,9 +60,9 @@ class Guild:
         await self.reload()
 
         await self._timeouts.init()
+        self.reconcile_timeouts()
 
-        scrims = self.scrim_managers.copy()
-        for scrim in scrims:
+        for scrim in self.scrim_managers:
             try:
                 await scrim.init()
             except Exception as error:
@@ -57,6 +71,10 @@ class Guild:
 
     async def reload(self):
         self.__timeout_role = self.settings.server.get("timeout_role", None)
+        if self.__timeout_role is not None:
+            self.bot.timeout_roles[self.id] = self.__timeout_role
+        else:
+            self.bot.timeout_roles.pop(self.id, None)
         self.__invite_channel: Optional[discord.TextChannel] = None
 
         channels = set([x.id for x in await self.discord_guild.fetch_channels()])
@@ -70,6 +88,8 @@ class Guild:
         self.mod_channel = None
         self.mod_channel = await self.fetch_mod_channel()
 
+        self.__index_timeout_role()
+
         self.broadcasts: list[scrimbot.Broadcaster] = []
         broadcast_channels = \
             set(s["broadcast_channel"] for s in self.settings.channels.values() if "broadcast_channel" in s)
@@ -128,7 +148,7 @@ class Guild:
         return self.__create_scrim_manager(scrim)
 
     def create_scrim(self, data: dict) -> scrimbot.Scrim:
-        scrim = scrimbot.Scrim(data=data, timezone=self.timezone, sync=self.queue_callable(self.__scrims.sync),
+        scrim = scrimbot.Scrim(data=data, timezone=self.timezone, sync=self.__scrims.mark_dirty,
                                log=self.log)
         if scrim.scrim_channel is not None:
             scrim.settings = self.settings.channel(scrim.scrim_channel)
@@ -141,34 +161,84 @@ class Guild:
                                               queue_task=self.queue_task,
                                               bot=self.bot,
                                               timeout_check=self.is_on_timeout)
-        self.scrim_managers.append(scrim_manager)
+        self.scrim_managers.add(scrim_manager)
+        self.bot.player_index.add_scrim(scrim_manager)
         return scrim_manager
 
-    def get_scrim_manager(self, id: int) -> scrimbot.ScrimManager:
-        return next(filter(lambda s: s.id == id, self.scrim_managers), None)
+    def get_scrim_manager(self, id: int) -> Optional[scrimbot.ScrimManager]:
+        return self.scrim_managers.get(id)
 
     def __remove_scrim(self, scrim_manager):
-        if scrim_manager in self.scrim_managers:
-            self.scrim_managers.remove(scrim_manager)
-        if scrim_manager.scrim.data in self.__scrims.data:
-            self.__scrims.data.remove(scrim_manager.scrim.data)
-        self.queue_callable(self.__scrims.sync)()
+        if self.scrim_managers.remove(scrim_manager):
+            self.bot.player_index.remove_scrim(scrim_manager)
+            self.__scrims.mark_dirty()
 
     def create_scrim_manager(self, scrim: scrimbot.Scrim):
-        self.__scrims.data.append(scrim.data)
-        self.queue_callable(self.__scrims.sync)()
         scrim_manager = self.__create_scrim_manager(scrim)
+        self.__scrims.mark_dirty()
         self.queue_task(scrim_manager.init())
 
+    def flush(self):
+        for store in self.__stores:
+            store.flush()
+
+    def close(self):
+        """Take this guild out of the bot wide indexes and stop its scheduled work, for a guild that is given up on."""
+        for scrim_manager in self.scrim_managers:
+            self.bot.player_index.remove_scrim(scrim_manager)
+            scrim_manager.close()
+        self._timeouts.close()
+        if self.__reconcile_event is not None:
+            self.bot.scheduler.cancel(self.__reconcile_event)
+        self.bot.timeout_roles.pop(self.id, None)
+
+    def __index_timeout_role(self):
+        """Collect the members holding the timeout role from the member cache, `on_member_update` keeps it current."""
+        dc_guild = self.bot.get_guild(int(self.id))
+        role = None
+        if dc_guild is not None and self.__timeout_role is not None:
+            role = dc_guild.get_role(self.__timeout_role)
+        self.__timeout_role_holders = set(m.id for m in role.members) if role is not None else set()
+
+    def reconcile_timeouts(self):
+        """End the stored timeouts of members that lost the timeout role while the bot wasn't watching, the role decides
+        like it does in `on_member_update`. Only cached members are compared so this never goes to REST, members that
+        left keep their stored timeout until it expires. Runs again every `RECONCILE_INTERVAL`."""
+        self.__index_timeout_role()
+        dc_guild = self.bot.get_guild(int(self.id))
+        if self.__timeout_role is not None and dc_guild is not None:
+            ended = [u for u in self._timeouts.user_ids()
+                     if u not in self.__timeout_role_holders and dc_guild.get_member(u) is not None
+                     and not self.__role_pending(u)]
+            for user_id in ended:
+                self.remove_user_timeout(user_id, reason="Timeout role was removed")
+            if len(ended) > 0:
+                _log.info(f"{self.name}: Ended the timeout of {len(ended)} users that lost the timeout role")
+
+        next_run = (datetime.now(timezone.utc) + Guild.RECONCILE_INTERVAL).timestamp()
+        if self.__reconcile_event is None:
+            self.__reconcile_event = self.bot.scheduler.schedule(next_run, self.reconcile_timeouts)
+        else:
+            self.bot.scheduler.reschedule(self.__reconcile_event, next_run)
+
+    def timeout_list(self, user_id: Optional[int] = None) -> list[tuple[int, Optional[timedelta]]]:
+        """Users holding the timeout role with their remaining timeout, None when it is indefinite."""
+        holders = self.__timeout_role_holders if user_id is None else self.__timeout_role_holders & {user_id}
+        return [(u, self.get_user_timeout(u)) for u in sorted(holders)]
+
     def is_on_timeout(self, user: discord.Member) -> bool:
         if any(r.id == self.__timeout_role for r in user.roles):
             return True
-        else:
-            if self._timeouts.contains_user(user.id):
-                # Clean up: User doesn't have timeout role but is still in 
-                # self._timeouts list: remove user from list
-                self._timeouts.remove_user(user.id)
-            return False
+        if self._timeouts.contains_user(user.id):
+            if self.__role_pending(user.id):
+                return True
+            # Clean up: the timeout role was removed, so the timeout has ended
+            self._timeouts.remove_user(user.id)
+        return False
+
+    def __role_pending(self, user_id: int) -> bool:
+        """Whether the timeout role of a new timeout is still waiting in the role queue."""
+        return self.__timeout_role is not None and self.__role_edits.pending(user_id, self.__timeout_role) is True
 
     async def update_broadcasts(self):
         for b in self.broadcasts:
@@ -187,20 +257,19 @@ class Guild:
     async def add_timeout_role(self, user_id, reason=None):
         if self.__timeout_role is None:
             return
-        dc_guild = self.bot.get_guild(int(self.id))
-        member = await dc_guild.fetch_member(user_id)
-        if member:
-            await member.add_roles(discord.Object(self.__timeout_role), reason=reason)
+        self.__role_edits.add(user_id, self.__timeout_role, reason=reason)
 
     async def remove_timeout_role(self, user_id, reason=None):
         if not self.__timeout_role:
             return
-        dc_guild = self.bot.get_guild(int(self.id))
-        member = await dc_guild.fetch_member(user_id)
-        if member:
-            await member.remove_roles(discord.Object(self.__timeout_role), reason=reason)
+        self.__role_edits.remove(user_id, self.__timeout_role, reason=reason)
 
     def on_member_update(self, before, after):
+        if any(role.id == self.__timeout_role for role in after.roles):
+            self.__timeout_role_holders.add(after.id)
+        else:
+            self.__timeout_role_holders.discard(after.id)
+
         if any(role.id == self.__timeout_role for role in before.roles) \
                 and all(role.id != self.__timeout_role for role in after.roles):
             # timeout role was removed
@@ -212,15 +281,6 @@ class Guild:
     def queue_task(self, coro) -> asyncio.Task:
         return self.bot.loop.create_task(coro)
 
-    def queue_callable(self, function: Callable) -> Callable:
-        async def inner():
-            function()
-
-        def queue():
-            self.queue_task(inner())
-
-        return queue
-
     def __queue_coroutine(self, function: Callable[..., Coroutine[Any, Any, Any]]) -> Callable:
         def queue():
             self.queue_task(function())
@@ -230,8 +290,4 @@ class Guild:
     def has_overlapping_scrims(self, scrim: scrimbot.Scrim) -> bool:
         earliest = scrim.time - timedelta(hours=1)
         latest = scrim.time + timedelta(hours=1)
-        for scrim_manager in self.scrim_managers:
-            if earliest < scrim_manager.scrim.time < latest and \
-                    scrim.scrim_channel == scrim_manager.scrim.scrim_channel:
-                return True
-        return False
+        return len(self.scrim_managers.in_channel(scrim.scrim_channel, earliest.timestamp(), latest.timestamp())) > 0
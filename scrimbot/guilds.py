@@ -1,4 +1,10 @@
+import asyncio
+import glob
 import logging
+import os
+import re
+import time
+from datetime import timedelta
 from typing import Union
 
 import discord
@@ -10,24 +16,100 @@ _log = logging.getLogger(__name__)
 
 
 class Guilds:
+    INIT_ATTEMPTS = 3
+    INIT_BACKOFF = 2
 
     def __init__(self, bot: discord.Bot):
         self.__bot = bot
         self.__guilds: dict[str, scrimbot.Guild] = {}
+        self.__initialising: dict[str, asyncio.Future] = {}
+        self.__players = scrimbot.PlayerIndex()
+        self.__timeout_roles: dict[str, int] = {}
+        bot.player_index = self.__players
+        bot.timeout_roles = self.__timeout_roles
         bot.scrim_overlap_check = self.get_overlapping_scrim_managers
 
     async def get(self, guild_id: Union[str, int]) -> scrimbot.Guild:
-        if str(guild_id) not in self.__guilds:
+        guild_id = str(guild_id)
+        if guild_id in self.__guilds:
+            return self.__guilds[guild_id]
+
+        # Everyone asking for a guild that is still initialising waits for the same init
+        if guild_id not in self.__initialising:
+            self.__initialising[guild_id] = asyncio.ensure_future(self.__create(guild_id))
+        return await asyncio.shield(self.__initialising[guild_id])
+
+    async def __create(self, guild_id: str) -> scrimbot.Guild:
+        try:
             _log.info(f"Creating guild {guild_id}")
-            self.__guilds[str(guild_id)] = scrimbot.Guild(str(guild_id), self.__bot)
-            await self.__guilds[str(guild_id)].init()
+            guild = scrimbot.Guild(guild_id, self.__bot)
+
+            backoff = Guilds.INIT_BACKOFF
+            for attempt in range(1, Guilds.INIT_ATTEMPTS + 1):
+                try:
+                    await guild.init()
+                    break
+                except Exception as error:
+                    if attempt == Guilds.INIT_ATTEMPTS:
+                        _log.error(f"Giving up on initialising guild {guild_id} due to {error}")
+                        guild.close()
+                        raise
+                    _log.error(f"Unable to initialise guild {guild_id} due to {error}, retrying in {backoff}s")
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+
+            self.__guilds[guild_id] = guild
             _log.info(f"Guild {guild_id} initialised")
-        return self.__guilds[str(guild_id)]
+            return guild
+        finally:
+            del self.__initialising[guild_id]
+
+    async def warm_up(self, concurrency: int = 4):
+        """Initialise every guild with data on disk, at most `concurrency` at a time to stay clear of rate limits."""
+        start = time.perf_counter()
+        guild_ids = [g for g in known_guild_ids() if self.__bot.get_guild(int(g)) is not None]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm_up_guild(guild_id: str):
+            async with semaphore:
+                guild_start = time.perf_counter()
+                try:
+                    await self.get(guild_id)
+                    _log.info(f"Guild {guild_id} warmed up in {time.perf_counter() - guild_start:.2f}s")
+                except Exception as error:
+                    _log.error(f"Unable to properly initialise guild {guild_id} due to {error}")
+                    _log.exception(error)
+
+        await asyncio.gather(*[warm_up_guild(g) for g in guild_ids])
+        _log.info(f"Warmed up {len(guild_ids)} guilds in {time.perf_counter() - start:.2f}s")
+
+    def flush(self):
+        for guild in self.__guilds.values():
+            guild.flush()
+
+    def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Forward member updates that add or remove the timeout role to the guild, if it is loaded. Everything else is
+        dropped on a lookup in the timeout roles the guilds registered, and this never creates a guild."""
+        role = self.__timeout_roles.get(str(after.guild.id), None)
+        if role is None or (before.get_role(role) is None) == (after.get_role(role) is None):
+            return
+
+        guild = self.__guilds.get(str(after.guild.id), None)
+        if guild is not None:
+            guild.on_member_update(before, after)
 
     def get_overlapping_scrim_managers(self, user: int, scrim_manager: ScrimManager) -> list[ScrimManager]:
-        scrim_managers = [sm for guild in self.__guilds.values()
-                          for sm in guild.scrim_managers
-                          if sm is not scrim_manager
-                          and sm.contains_player(user)
-                          and sm.scrim.overlaps_with(scrim_manager.scrim)]
-        return scrim_managers
+        earliest = (scrim_manager.scrim.time - timedelta(hours=1)).timestamp()
+        latest = (scrim_manager.scrim.time + timedelta(hours=1)).timestamp()
+        return [sm for sm in self.__players.scrims(user, earliest, latest) if sm is not scrim_manager]
+
+
+def known_guild_ids(directory: str = "data") -> list[str]:
+    """Ids of the guilds with scrims, timeouts or a log on disk, in either storage engine."""
+    ids = set()
+    for file in glob.glob(os.path.join(directory, "*")):
+        match = re.fullmatch(r"(\d+)(-scrims\.json|-timeouts\.json|-log\.jsonl|-log\.json|\.sqlite3)",
+                             os.path.basename(file))
+        if match is not None:
+            ids.add(match.group(1))
+    return sorted(ids)
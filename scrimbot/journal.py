@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional, Iterable
+
+from scrimbot.store import write_atomically, Flusher
+
+_log = logging.getLogger(__name__)
+
+
+class Journal:
+    """Append-only JSON-lines file of entries with an `id`, loaded into `entries` keyed by that id. New entries are
+    appended as a single line and removals are written as a `{"removed": id}` tombstone, so the cost of a change doesn't
+    depend on the size of the history. Once dead lines outnumber the live entries the file is compacted, in the
+    background or when it is loaded. A file with an unreadable or unterminated line, left by a crash during a write, is
+    compacted right away so new lines don't end up glued to it."""
+
+    COMPACT_MIN = 1000
+
+    def __init__(self, file: str, legacy_file: Optional[str] = None, queue_task: Optional[Callable] = None,
+                 interval: float = 2.0):
+        self.__file = file
+        self.__legacy_file = legacy_file
+        self.__queue_task = queue_task
+        self.__pending: list[str] = []
+        self.__compact = False
+        self.__dead = 0
+        self.__torn = False
+        self.__flusher = Flusher(file, lambda: self.dirty, self.flush_async, queue_task, interval)
+        self.__write_lock = threading.Lock()
+        self.__batches: list[tuple[int, bool, str]] = []
+        self.__batch_number = 0
+        self.appends = 0
+        self.compactions = 0
+        self.entries: dict[str, dict] = self.__load()
+
+        if self.__torn:
+            self.__replace(self.__lines(self.entries.values()))
+            self.__dead = 0
+        elif self.__needs_compaction():
+            self.__compact = True
+            self.__schedule()
+
+    @property
+    def file(self):
+        return self.__file
+
+    @property
+    def dirty(self) -> bool:
+        # Batches that failed to write stay queued until a later flush gets them out
+        return self.__compact or len(self.__pending) > 0 or len(self.__batches) > 0
+
+    def __load(self) -> dict[str, dict]:
+        if not os.path.exists(self.__file) and self.__legacy_file is not None and os.path.exists(self.__legacy_file):
+            return self.__migrate()
+
+        entries: dict[str, dict] = {}
+        removed = set()
+        try:
+            with open(self.__file, 'r') as file:
+                for number, line in enumerate(file):
+                    if not line.endswith("\n"):
+                        self.__torn = True
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Most likely the last line of a write that got interrupted
+                        _log.error(f"Skipping unreadable line {number + 1} in '{self.__file}'")
+                        self.__torn = True
+                        continue
+                    if "removed" in record:
+                        removed.add(record["removed"])
+                    else:
+                        entries[record["id"]] = record
+        except FileNotFoundError:
+            print(f"'{self.__file}' not found, initialising")
+            return {}
+
+        # Tombstones are applied last, a batch written during shutdown may have ended up before an earlier one
+        self.__dead += 2 * len(removed)
+        return {i: e for i, e in entries.items() if i not in removed}
+
+    def __migrate(self) -> dict[str, dict]:
+        try:
+            with open(self.__legacy_file, 'r') as file:
+                entries = {e["id"]: e for e in json.load(file)}
+        except:
+            os.rename(self.__legacy_file, f"{self.__legacy_file}.bad")
+            return {}
+
+        _log.info(f"Migrating '{self.__legacy_file}' to '{self.__file}'")
+        self.__replace(self.__lines(entries.values()))
+        os.rename(self.__legacy_file, f"{self.__legacy_file}.migrated")
+        return entries
+
+    def __needs_compaction(self) -> bool:
+        return self.__dead > max(len(self.entries), Journal.COMPACT_MIN)
+
+    def append(self, entry: dict):
+        self.__pending.append(json.dumps(entry) + "\n")
+        self.__schedule()
+
+    def remove(self, ids: list[str]):
+        if len(ids) == 0:
+            return
+
+        for i in ids:
+            self.__pending.append(json.dumps({"removed": i}) + "\n")
+        self.__dead += 2 * len(ids)
+
+        if self.__needs_compaction():
+            self.__compact = True
+        self.__schedule()
+
+    def __schedule(self):
+        if self.__queue_task is None:
+            self.flush()
+            return
+
+        self.__flusher.schedule()
+
+    def flush(self):
+        """Write pending changes right away, used on shutdown."""
+        if self.dirty:
+            self.__write_through(self.__queue_batch())
+
+    async def flush_async(self):
+        """Write pending changes from a worker thread."""
+        if not self.dirty:
+            return
+
+        number = self.__queue_batch()
+        await asyncio.get_running_loop().run_in_executor(None, self.__write_through, number)
+
+    def __queue_batch(self) -> int:
+        """Queue the pending changes as a batch, returns the number of the last queued batch."""
+        if not self.__compact and len(self.__pending) == 0:
+            return self.__batch_number
+
+        if self.__compact:
+            # The live entries already reflect everything that is pending
+            batch = (True, self.__lines(self.entries.values()))
+            self.__compact = False
+            self.__dead = 0
+        else:
+            batch = (False, "".join(self.__pending))
+        self.__pending = []
+
+        with self.__write_lock:
+            self.__batch_number += 1
+            self.__batches.append((self.__batch_number, *batch))
+            return self.__batch_number
+
+    def __write_through(self, number: int):
+        # Batches are written strictly in order, whichever thread gets here first writes the earlier ones as well
+        with self.__write_lock:
+            while len(self.__batches) > 0 and self.__batches[0][0] <= number:
+                _, compact, content = self.__batches[0]
+                if compact:
+                    self.__replace(content)
+                    self.compactions += 1
+                else:
+                    with open(self.__file, 'a') as file:
+                        file.write(content)
+                    self.appends += 1
+                self.__batches.pop(0)
+
+    def __replace(self, content: str):
+        write_atomically(self.__file, content)
+
+    @staticmethod
+    def __lines(entries: Iterable[dict]) -> str:
+        return "".join(json.dumps(e) + "\n" for e in entries)
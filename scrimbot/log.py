@@ -1,15 +1,109 @@
+import bisect
 import math
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Callable
+from typing import Callable, Optional
+
+import scrimbot
+
+
+class _Timeline:
+    """Entries ordered by time, with the timestamps kept in a parallel list so a window starting at any point in time
+    is found with a binary search."""
+
+    def __init__(self):
+        self.entries: list[dict] = []
+        self.times: list[float] = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def add(self, entry: dict):
+        if len(self.times) == 0 or entry["time"] >= self.times[-1]:
+            self.entries.append(entry)
+            self.times.append(entry["time"])
+        else:
+            index = bisect.bisect_right(self.times, entry["time"])
+            self.entries.insert(index, entry)
+            self.times.insert(index, entry["time"])
+
+    def remove(self, entry: dict):
+        index = bisect.bisect_left(self.times, entry["time"])
+        while self.entries[index] is not entry:
+            index += 1
+        del self.entries[index]
+        del self.times[index]
+
+    def remove_all(self, entries: set[int]):
+        """Remove a batch of entries, given by `id()`, in a single pass."""
+        kept = [(e, t) for e, t in zip(self.entries, self.times) if id(e) not in entries]
+        self.entries = [e for e, _ in kept]
+        self.times = [t for _, t in kept]
+
+    def since(self, timestamp: float) -> list[dict]:
+        return self.entries[bisect.bisect_right(self.times, timestamp):]
+
+    def count_since(self, timestamp: float) -> int:
+        return len(self.times) - bisect.bisect_right(self.times, timestamp)
 
 
 class Log:
 
-    def __init__(self, data: list, sync: Callable, get_user: Callable[[int], dict]):
+    def __init__(self, journal: scrimbot.Journal, get_user: Callable[[int], dict]):
         self.__get_user = get_user
-        self.__log = data
-        self.__sync = sync
+        self.__journal = journal
+        self.__log = journal.entries
+        self.__users: dict[int, dict[str, _Timeline]] = defaultdict(lambda: defaultdict(_Timeline))
+        self.__authors: dict[int, dict[str, _Timeline]] = defaultdict(lambda: defaultdict(_Timeline))
+        self.__types: dict[str, _Timeline] = defaultdict(_Timeline)
+        self.__leaderboards: dict[tuple[str, str], _Leaderboard] = {}
+
+        for entry in self.__log.values():
+            self.__index(entry)
+
+    def __index(self, entry: dict):
+        self.__users[entry["user"]][entry["type"]].add(entry)
+        self.__authors[entry["author"]][entry["type"]].add(entry)
+        self.__types[entry["type"]].add(entry)
+        for (type, _), leaderboard in self.__leaderboards.items():
+            if type == entry["type"]:
+                leaderboard.add(entry)
+
+    def __unindex(self, entry: dict):
+        self.__users[entry["user"]][entry["type"]].remove(entry)
+        self.__authors[entry["author"]][entry["type"]].remove(entry)
+        self.__types[entry["type"]].remove(entry)
+        self.__update_leaderboards(entry)
+
+    def __update_leaderboards(self, removed: dict):
+        for (type, _), leaderboard in self.__leaderboards.items():
+            if type == removed["type"]:
+                leaderboard.remove(removed, len(self.__users[removed["user"]][removed["type"]]))
+
+    def __unindex_all(self, entries: list[dict]):
+        timelines = {}
+        for entry in entries:
+            for timeline in (self.__users[entry["user"]][entry["type"]],
+                             self.__authors[entry["author"]][entry["type"]],
+                             self.__types[entry["type"]]):
+                timelines[id(timeline)] = timeline
+
+        removed = set(id(x) for x in entries)
+        for timeline in timelines.values():
+            timeline.remove_all(removed)
+
+        for entry in entries:
+            self.__update_leaderboards(entry)
+
+    def __by_user(self, user: int, type: str) -> _Timeline:
+        return self.__users[user][type] if user in self.__users else _Timeline()
+
+    def __by_author(self, author: int, type: str) -> _Timeline:
+        return self.__authors[author][type] if author in self.__authors else _Timeline()
 
     def add_note(self, user: int, author: int, text: str):
         self.__add_entry("note", user, author, text)
@@ -39,38 +133,47 @@ class Log:
             "type": type}
         entry.update(kwargs)
 
-        self.__log.append(entry)
-        self.__sync()
+        self.__log[entry["id"]] = entry
+        self.__index(entry)
+        self.__journal.append(entry)
 
     def warning_count(self, user: int) -> int:
-        return len([d for d in self.__log if d['type'] == "warning" and d['user'] == user])
+        return len(self.__by_user(user, "warning"))
 
     def weekly_warning_count(self, user: int) -> int:
         start_time = (datetime.now(timezone.utc) - timedelta(days=7)).timestamp()
 
-        return len([d for d in self.__log
-                    if d['type'] == "warning" and d['user'] == user and d['time'] > start_time])
+        return self.__by_user(user, "warning").count_since(start_time)
 
     def scrim_count(self, user: int, start_time=datetime.min) -> int:
         timestamp = 0 if start_time == datetime.min else start_time.timestamp()
-        return len([d for d in self.__log
-                    if d['type'] == "scrim" and d['user'] == user and d['time'] > timestamp])
+        return self.__by_user(user, "scrim").count_since(timestamp)
 
     def daily_report_count(self, user: int) -> int:
         start_time = (datetime.now(timezone.utc) - timedelta(days=1)).timestamp()
 
-        return len([d for d in self.__log
-                    if d['type'] == "report" and d['author'] == user and d['time'] > start_time])
+        return self.__by_author(user, "report").count_since(start_time)
 
     def remove(self, predicate) -> int:
+        return self.__remove([x for x in self.__log.values() if predicate(x)])
 
-        to_remove = [x for x in self.__log if predicate(x)]
+    def remove_id(self, id: str) -> int:
+        return self.__remove([self.__log[id]] if id in self.__log else [])
 
-        if len(to_remove) > 0:
-            for logentry in to_remove:
-                self.__log.remove(logentry)
-            self.__sync()
-        return len(to_remove)
+    def remove_user(self, user: int) -> int:
+        return self.__remove([x for timeline in self.__users.get(user, {}).values() for x in timeline])
+
+    def __remove(self, entries: list[dict]) -> int:
+        if len(entries) == 1:
+            self.__unindex(entries[0])
+        elif len(entries) > 1:
+            self.__unindex_all(entries)
+
+        for entry in entries:
+            del self.__log[entry["id"]]
+
+        self.__journal.remove([x["id"] for x in entries])
+        return len(entries)
 
     ALL = ["warning", "note", "report", "scrim-kick", "timeout", "scrim"]
 
@@ -78,54 +181,121 @@ class Log:
         if types is None:
             types = ["warning"]
 
-        entries = [x for x in self.__log if x["type"] in types and (x["user"] == user or x["author"] == user)]
+        entries = {id(x): x for t in types for x in [*self.__by_user(user, t), *self.__by_author(user, t)]}
         output = []
 
-        for entry in entries:
-            start = f"[{entry['id']}] <t:{math.floor(entry['time'])}:d>"
-            author = f" by <@{entry['author']}>" if authors else ""
-            if entry["type"] == "note" and entry["user"] == user:
-                output.append(f"{start} note{author}: {entry['text']}")
-            elif entry["type"] == "warning" and entry["user"] == user:
-                output.append(f"{start} ⚠ got warned{author}: {entry['text']}")
-            elif entry["type"] == "warning" and entry["author"] == user:
-                output.append(f"{start} warned <@{entry['user']}>: {entry['text']}")
-            elif entry["type"] == "report" and entry["user"] == user:
-                output.append(f"{start} ⚠ got reported{author} in <#{entry['channel']}>: {entry['text']}")
-            elif entry["type"] == "report" and entry["author"] == user:
-                output.append(f"{start} reported <@{entry['user']}> in <#{entry['channel']}>: {entry['text']}")
-            elif entry["type"] == "scrim-kick" and entry["user"] == user:
-                output.append(f"{start} ⚠ got kicked from a scrim{author} in <#{entry['channel']}>: {entry['text']}")
-            elif entry["type"] == "scrim-kick" and entry["author"] == user:
-                output.append(
-                    f"{start} kicked <@{entry['user']}> from a scrim in <#{entry['channel']}>: {entry['text']}")
-            elif entry["type"] == "timeout" and entry["user"] == user:
-                output.append(f"{start} ⚠ was put on a timeout{author}: {entry['text']}")
-            elif entry["type"] == "timeout" and entry["author"] == user:
-                output.append(f"{start} timed out <@{entry['user']}>: {entry['text']}")
-            elif entry["type"] == "scrim" and entry["user"] == user:
-                output.append(f"{start} (probably) played a scrim: {entry['text']}")
+        for entry in sorted(entries.values(), key=lambda x: x["time"]):
+            line = Log.format_entry(entry, user, authors)
+            if line is not None:
+                output.append(line)
 
         return output
 
-    def print_warning_top(self, recent=False) -> list:
-        selected = "recents" if recent else "warns"
-
-        users = set([x["user"] for x in self.__log if x["type"] == "warning"])
-        warning_list = [{
-            "user": x,
-            "warns": self.warning_count(x),
-            "recents": self.weekly_warning_count(x)
-        } for x in users]
-        warning_list.sort(key=lambda x: x[selected], reverse=True)
-        return [f"<@{x['user']}> {x['warns']}/{x['recents']}" for x in warning_list]
-
-    def print_scrim_top(self, start_time=datetime.min) -> list:
-        users = set([x["user"] for x in self.__log if x["type"] == "scrim"])
-        top_list = [{
-            "user": x,
-            "scrims": self.scrim_count(x, start_time=start_time),
-            "oculus": self.__get_user(x).get("name", "")
-        } for x in users]
-        top_list.sort(key=lambda x: x["scrims"], reverse=True)
-        return [f"<@{x['user']}> {x['oculus']} {x['scrims']}" for x in top_list]
+    @staticmethod
+    def format_entry(entry: dict, user: int, authors=False) -> Optional[str]:
+        start = f"[{entry['id']}] <t:{math.floor(entry['time'])}:d>"
+        author = f" by <@{entry['author']}>" if authors else ""
+        if entry["type"] == "note" and entry["user"] == user:
+            return f"{start} note{author}: {entry['text']}"
+        elif entry["type"] == "warning" and entry["user"] == user:
+            return f"{start} ⚠ got warned{author}: {entry['text']}"
+        elif entry["type"] == "warning" and entry["author"] == user:
+            return f"{start} warned <@{entry['user']}>: {entry['text']}"
+        elif entry["type"] == "report" and entry["user"] == user:
+            return f"{start} ⚠ got reported{author} in <#{entry['channel']}>: {entry['text']}"
+        elif entry["type"] == "report" and entry["author"] == user:
+            return f"{start} reported <@{entry['user']}> in <#{entry['channel']}>: {entry['text']}"
+        elif entry["type"] == "scrim-kick" and entry["user"] == user:
+            return f"{start} ⚠ got kicked from a scrim{author} in <#{entry['channel']}>: {entry['text']}"
+        elif entry["type"] == "scrim-kick" and entry["author"] == user:
+            return f"{start} kicked <@{entry['user']}> from a scrim in <#{entry['channel']}>: {entry['text']}"
+        elif entry["type"] == "timeout" and entry["user"] == user:
+            return f"{start} ⚠ was put on a timeout{author}: {entry['text']}"
+        elif entry["type"] == "timeout" and entry["author"] == user:
+            return f"{start} timed out <@{entry['user']}>: {entry['text']}"
+        elif entry["type"] == "scrim" and entry["user"] == user:
+            return f"{start} (probably) played a scrim: {entry['text']}"
+        return None
+
+    def __leaderboard(self, type: str, period: str) -> "_Leaderboard":
+        if (type, period) not in self.__leaderboards:
+            self.__leaderboards[(type, period)] = _Leaderboard(self.__types[type], period_start(period))
+        leaderboard = self.__leaderboards[(type, period)]
+        leaderboard.roll(period_start(period))
+        return leaderboard
+
+    def print_warning_top(self, recent=False, limit=0) -> list:
+        warns = self.__leaderboard("warning", "All")
+        recents = self.__leaderboard("warning", "Week")
+
+        warning_list = (recents if recent else warns).ranked()
+        if limit > 0:
+            warning_list = warning_list[:limit]
+        return [f"<@{x}> {warns.counts[x]}/{recents.counts[x]}" for x in warning_list]
+
+    def print_scrim_top(self, period="All", limit=0) -> list:
+        scrims = self.__leaderboard("scrim", period)
+
+        top_list = scrims.ranked()
+        if limit > 0:
+            top_list = top_list[:limit]
+        return [f"<@{x}> {self.__get_user(x).get('name', '')} {scrims.counts[x]}" for x in top_list]
+
+
+class _Leaderboard:
+    """Materialized per-user counts of the entries in a timeline that are newer than `start`. Every user with an entry
+    in the timeline has a count, users with nothing in the window count as 0. Adding and removing entries updates the
+    counts, moving the window forward only touches the entries that drop out of it."""
+
+    def __init__(self, timeline: _Timeline, start: float):
+        self.__timeline = timeline
+        self.__start = start
+        self.__ranked: Optional[list[int]] = None
+        self.counts: dict[int, int] = {}
+        self.__rebuild(start)
+
+    def __rebuild(self, start: float):
+        self.__start = start
+        self.counts = {}
+        for entry in self.__timeline:
+            self.add(entry)
+
+    def add(self, entry: dict):
+        self.counts[entry["user"]] = self.counts.get(entry["user"], 0) + (1 if entry["time"] > self.__start else 0)
+        self.__ranked = None
+
+    def remove(self, entry: dict, remaining: int):
+        if entry["user"] not in self.counts:
+            return
+        if remaining == 0:
+            del self.counts[entry["user"]]
+        elif entry["time"] > self.__start:
+            self.counts[entry["user"]] -= 1
+        self.__ranked = None
+
+    def roll(self, start: float):
+        if start < self.__start:
+            self.__rebuild(start)
+            return
+
+        times = self.__timeline.times
+        left = self.__timeline.entries[bisect.bisect_right(times, self.__start):bisect.bisect_right(times, start)]
+        for entry in left:
+            self.counts[entry["user"]] -= 1
+        self.__start = start
+        if len(left) > 0:
+            self.__ranked = None
+
+    def ranked(self) -> list[int]:
+        if self.__ranked is None:
+            self.__ranked = sorted(self.counts.keys(), key=self.counts.__getitem__, reverse=True)
+        return self.__ranked
+
+
+def period_start(period: str) -> float:
+    """Timestamp after which log entries count for a `/scrim_top` period: All, Month or Week."""
+    if period == "Week":
+        return (datetime.now(timezone.utc) - timedelta(weeks=1)).timestamp()
+    if period == "Month":
+        return (datetime.now(timezone.utc).replace(day=1) - timedelta(days=1)).timestamp()
+    return 0
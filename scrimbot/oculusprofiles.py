@@ -1,6 +1,7 @@
 import html
 import logging
 import re
+from collections import OrderedDict
 from typing import Optional
 
 import aiohttp
@@ -13,12 +14,16 @@ _log = logging.getLogger(__name__)
 
 
 class OculusProfiles:
+    EMBED_CACHE_SIZE = 1024
 
     def __init__(self, bot: discord.Bot, guilds: scrimbot.Guilds):
         self.guilds = guilds
         self.__bot = bot
-        self.__profiles: scrimbot.Store[dict] = scrimbot.Store[dict]("data/oculus_profiles.json", {})
+        self.__profiles: scrimbot.Store[dict] = scrimbot.Store[dict]("data/oculus_profiles.json", {},
+                                                                     queue_task=bot.loop.create_task)
         self.__session = aiohttp.ClientSession()
+        self.__versions: dict[int, int] = {}
+        self.__embeds: OrderedDict[tuple[int, int, bool], discord.Embed] = OrderedDict()
 
     async def refresh_profile(self, user: discord.Member):
         data: Optional[dict] = self.__profiles.data.get(str(user.id), None)
@@ -67,15 +72,19 @@ class OculusProfiles:
             "previous_names": aka,
             "profile_url": profile_link
         }
-        self.__sync()
+        self.__profiles.mark_dirty()
+        self.__invalidate_embeds(user.id)
 
         return "Profile set!"
 
-    def __sync(self):
-        async def inner():
-            self.__profiles.sync()
+    def __invalidate_embeds(self, user: int):
+        version = self.__versions.get(user, 0)
+        self.__embeds.pop((user, version, False), None)
+        self.__embeds.pop((user, version, True), None)
+        self.__versions[user] = version + 1
 
-        self.__bot.loop.create_task(inner())
+    def flush(self):
+        self.__profiles.flush()
 
     def get_profile(self, user: discord.Member) -> dict:
         return self.__profiles.data.get(str(user.id), {})
@@ -84,6 +93,32 @@ class OculusProfiles:
         return self.__profiles.data.get(str(identifier), {})
 
     async def get_embed(self, user: int, long=True, guild=None) -> Optional[discord.Embed]:
+        embed = self.__cached_embed(user, long)
+
+        if embed is not None and long and guild is not None:
+            embed = embed.copy()
+            guild = await self.guilds.get(guild)
+            scrim_count = guild.log.scrim_count(user)
+            embed.add_field(name="Scrims played", value=scrim_count, inline=True)
+
+        return embed
+
+    def __cached_embed(self, user: int, long: bool) -> Optional[discord.Embed]:
+        """Rendered profile embeds are shared between every scrim showing the user, the least recently used ones are
+        dropped once there are more than `EMBED_CACHE_SIZE`."""
+        key = (user, self.__versions.get(user, 0), long)
+        if key in self.__embeds:
+            self.__embeds.move_to_end(key)
+            return self.__embeds[key]
+
+        embed = self.__create_embed(user, long)
+        if embed is not None:
+            self.__embeds[key] = embed
+            if len(self.__embeds) > OculusProfiles.EMBED_CACHE_SIZE:
+                self.__embeds.popitem(last=False)
+        return embed
+
+    def __create_embed(self, user: int, long: bool) -> Optional[discord.Embed]:
         data: Optional[dict] = self.__profiles.data.get(str(user), None)
 
         if data is None:
@@ -102,11 +137,6 @@ class OculusProfiles:
         if long and len(data['previous_names']) > 0:
             embed.add_field(name="Previous names", value="\n".join(data['previous_names']), inline=True)
 
-        if long and guild is not None:
-            guild = await self.guilds.get(guild)
-            scrim_count = guild.log.scrim_count(user)
-            embed.add_field(name="Scrims played", value=scrim_count, inline=True)
-
         embed.set_thumbnail(url=data['avatar'])
 
         return embed
@@ -0,0 +1,45 @@
+import math
+
+import scrimbot
+from scrimbot.timeindex import TimeIndex
+
+
+class PlayerIndex:
+    """The scrims every user signed up for, as player or reserve, over all guilds and ordered by scrim time. Scrims are
+    added when their manager is created and keep the index up to date through `Scrim.on_user_change`."""
+
+    def __init__(self):
+        self.__users: dict[int, TimeIndex[scrimbot.ScrimManager]] = {}
+
+    def __len__(self):
+        return len(self.__users)
+
+    def add_scrim(self, scrim_manager: scrimbot.ScrimManager):
+        scrim_manager.scrim.on_user_change = lambda user: self.update(user, scrim_manager)
+        for user in scrim_manager.scrim.users:
+            self.update(user, scrim_manager)
+
+    def remove_scrim(self, scrim_manager: scrimbot.ScrimManager):
+        scrim_manager.scrim.on_user_change = None
+        for user in scrim_manager.scrim.users:
+            self.__remove(user, scrim_manager)
+
+    def update(self, user: int, scrim_manager: scrimbot.ScrimManager):
+        if not scrim_manager.scrim.contains_user(user):
+            self.__remove(user, scrim_manager)
+            return
+        if user not in self.__users:
+            self.__users[user] = TimeIndex()
+        self.__users[user].add(scrim_manager.id, scrim_manager.scrim.time.timestamp(), scrim_manager)
+
+    def __remove(self, user: int, scrim_manager: scrimbot.ScrimManager):
+        if user in self.__users:
+            self.__users[user].remove(scrim_manager.id)
+            if len(self.__users[user]) == 0:
+                del self.__users[user]
+
+    def contains(self, user: int) -> bool:
+        return user in self.__users
+
+    def scrims(self, user: int, start: float = -math.inf, end: float = math.inf) -> list[scrimbot.ScrimManager]:
+        return self.__users[user].between(start, end) if user in self.__users else []
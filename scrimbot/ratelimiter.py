@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Coroutine, Any, Optional, Hashable
+
+_log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `capacity` actions at once, refilling at `capacity` per `period` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.__tokens = float(capacity)
+        self.__updated = time.monotonic()
+
+    @property
+    def tokens(self) -> float:
+        now = time.monotonic()
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+        self.__updated = now
+        return self.__tokens
+
+    @property
+    def level(self) -> float:
+        return self.tokens / self.capacity
+
+    def delay(self) -> float:
+        """Seconds until the next action is allowed."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self):
+        self.__tokens = self.tokens - 1
+
+
+class RateLimiter:
+    """Token buckets for message edits, one per channel and one per target message. Work for a target waits until both
+    buckets allow it, a newer payload for a target replaces the one still waiting so only the latest is sent. Work for
+    one target is sent in order, one at a time. Buckets that filled up again are forgotten, `channel_levels` and
+    `target_levels` show how much is left of the others."""
+
+    CHANNEL_BUCKET = (5, 5.0)  # Discord allows about 5 message edits per 5 seconds in a channel
+    MESSAGE_BUCKET = (1, 1.0)
+
+    def __init__(self, queue_task: Callable):
+        self.__queue_task = queue_task
+        self.__channels: dict[int, TokenBucket] = {}
+        self.__targets: dict[Hashable, TokenBucket] = {}
+        self.__pending: dict[Hashable, tuple[int, Callable[[], Coroutine[Any, Any, Any]], asyncio.Future]] = {}
+        self.__senders: dict[Hashable, asyncio.Task] = {}
+        self.sent = 0
+        self.replaced = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self.__pending)
+
+    @property
+    def channel_levels(self) -> dict[int, float]:
+        """Fraction of the edits left per channel, channels that aren't listed are full."""
+        return {c: b.level for c, b in self.__channels.items()}
+
+    @property
+    def target_levels(self) -> dict[Hashable, float]:
+        return {t: b.level for t, b in self.__targets.items()}
+
+    def submit(self, channel: int, target: Hashable, send: Callable[[], Coroutine[Any, Any, Any]],
+               bucket: Optional[tuple[int, float]] = None) -> asyncio.Future:
+        """Run `send` for `target` in `channel` once the buckets allow it. `bucket` is the (capacity, period) of the
+        target, `MESSAGE_BUCKET` when not given. The returned future is True once `send` succeeded and False when it
+        failed or was replaced or discarded before it was sent."""
+        if target in self.__pending:
+            self.replaced += 1
+            self.discard(target)
+        sent = asyncio.get_running_loop().create_future()
+        self.__pending[target] = (channel, send, sent)
+
+        if target not in self.__targets:
+            self.__targets[target] = TokenBucket(*(bucket or RateLimiter.MESSAGE_BUCKET))
+        if channel not in self.__channels:
+            self.__channels[channel] = TokenBucket(*RateLimiter.CHANNEL_BUCKET)
+        if target not in self.__senders:
+            self.__senders[target] = self.__queue_task(self.__send(target))
+        return sent
+
+    def discard(self, target: Hashable):
+        """Drop the work still waiting for `target`."""
+        pending = self.__pending.pop(target, None)
+        if pending is not None:
+            RateLimiter.__resolve(pending[2], False)
+
+    async def __send(self, target: Hashable):
+        try:
+            while target in self.__pending:
+                channel, send, sent = self.__pending[target]
+                delay = max(self.__channels[channel].delay(), self.__targets[target].delay())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                del self.__pending[target]
+                self.__channels[channel].take()
+                self.__targets[target].take()
+                self.sent += 1
+                try:
+                    await send()
+                    RateLimiter.__resolve(sent, True)
+                except Exception as error:
+                    _log.error(f"Unable to send {target} due to {error}")
+                    _log.exception(error)
+                    RateLimiter.__resolve(sent, False)
+        finally:
+            del self.__senders[target]
+            self.__prune()
+
+    @staticmethod
+    def __resolve(sent: asyncio.Future, result: bool):
+        # The future is cancelled along with whoever was waiting on it
+        if not sent.done():
+            sent.set_result(result)
+
+    def __prune(self):
+        """Forget buckets that are full again, a new one starts out full anyway."""
+        for buckets, busy in [(self.__targets, self.__senders.keys()),
+                              (self.__channels, set(c for c, _, _ in self.__pending.values()))]:
+            for key in [k for k, b in buckets.items() if k not in busy and b.tokens >= b.capacity]:
+                del buckets[key]
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import discord
+
+_log = logging.getLogger(__name__)
+
+
+class RoleQueue:
+    """Role changes of guild members waiting to be applied, at most one every `interval` seconds so bursts don't run
+    into rate limits. A newer change of the same role for a member replaces the one still waiting. Members are taken
+    from the cache and only fetched when they are not in it, members that already have the wanted state are skipped."""
+
+    def __init__(self, get_guild: Callable[[], Optional[discord.Guild]], queue_task: Callable, interval: float = 1.0):
+        self.__get_guild = get_guild
+        self.__queue_task = queue_task
+        self.__interval = interval
+        self.__pending: dict[tuple[int, int], tuple[bool, Optional[str]]] = {}
+        self.__task: Optional[asyncio.Task] = None
+        self.applied = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.__pending)
+
+    def pending(self, user: int, role: int) -> Optional[bool]:
+        """The change waiting for or being applied to a role of a member, True when the role is added and None when
+        nothing is waiting."""
+        change = self.__pending.get((user, role), None)
+        return change[0] if change is not None else None
+
+    def add(self, user: int, role: int, reason: Optional[str] = None):
+        self.__queue(user, role, True, reason)
+
+    def remove(self, user: int, role: int, reason: Optional[str] = None):
+        self.__queue(user, role, False, reason)
+
+    def __queue(self, user: int, role: int, add: bool, reason: Optional[str]):
+        self.__pending.pop((user, role), None)
+        self.__pending[(user, role)] = (add, reason)
+        if self.__task is None:
+            self.__task = self.__queue_task(self.__run())
+
+    async def __run(self):
+        try:
+            while len(self.__pending) > 0:
+                (user, role), change = next(iter(self.__pending.items()))
+                add, reason = change
+                try:
+                    requested = await self.__apply(user, role, add, reason)
+                except discord.DiscordException as error:
+                    _log.error(f"Unable to {'add' if add else 'remove'} role {role} of {user} due to {error}")
+                    requested = True
+                # A change stays pending until it is applied, unless a newer one replaced it in the meantime
+                if self.__pending.get((user, role), None) is change:
+                    del self.__pending[(user, role)]
+                if requested:
+                    await asyncio.sleep(self.__interval)
+        finally:
+            self.__task = None
+
+    async def __apply(self, user: int, role: int, add: bool, reason: Optional[str]) -> bool:
+        """Apply a change, returns whether Discord was asked to change the roles."""
+        guild = self.__get_guild()
+        if guild is None:
+            return False
+
+        member = guild.get_member(user)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user)
+            except discord.NotFound:
+                return False
+
+        if any(r.id == role for r in member.roles) == add:
+            self.skipped += 1
+            return False
+
+        if add:
+            await member.add_roles(discord.Object(role), reason=reason)
+        else:
+            await member.remove_roles(discord.Object(role), reason=reason)
+        self.applied += 1
+        return True
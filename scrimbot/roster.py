@@ -0,0 +1,69 @@
+import heapq
+import itertools
+from typing import Optional, Iterator
+
+
+class Roster:
+    """Users signed up to a scrim keyed by id, in signup order. The list of user dicts stays in the scrim data so it
+    serialises as before, the roster only adds an index on top of it. Reserves that want to join automatically are kept
+    in a heap by signup order, so the first one is found without scanning the list."""
+
+    def __init__(self, members: list[dict]):
+        self.__list = members
+        self.__members: dict[int, dict] = {}
+        self.__order: dict[int, int] = {}
+        self.__sequence = itertools.count()
+        self.__auto: list[tuple[int, int]] = []
+
+        for member in members:
+            self.__index(member)
+
+    def __index(self, member: dict):
+        self.__members[member["id"]] = member
+        self.__order[member["id"]] = next(self.__sequence)
+        if "auto" in member:
+            heapq.heappush(self.__auto, (self.__order[member["id"]], member["id"]))
+
+    def __len__(self):
+        return len(self.__list)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.__list)
+
+    def __contains__(self, user: int):
+        return user in self.__members
+
+    def get(self, user: int) -> Optional[dict]:
+        return self.__members.get(user, None)
+
+    def add(self, member: dict):
+        self.remove(member["id"])
+        self.__list.append(member)
+        self.__index(member)
+
+    def remove(self, user: int) -> Optional[dict]:
+        member = self.__members.pop(user, None)
+        if member is not None:
+            del self.__order[user]
+            self.__list.remove(member)
+        return member
+
+    def set_auto(self, user: int, auto: bool) -> bool:
+        member = self.get(user)
+        if member is None:
+            return False
+        if auto:
+            member["auto"] = True
+            heapq.heappush(self.__auto, (self.__order[user], user))
+        elif "auto" in member:
+            del member["auto"]
+        return True
+
+    def next_auto(self) -> Optional[dict]:
+        """The member that signed up first of those with auto-join turned on."""
+        while len(self.__auto) > 0:
+            order, user = self.__auto[0]
+            if self.__order.get(user, None) == order and "auto" in self.__members[user]:
+                return self.__members[user]
+            heapq.heappop(self.__auto)
+        return None
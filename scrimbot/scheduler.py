@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from typing import Callable, Optional, Any
+
+_log = logging.getLogger(__name__)
+
+
+class ScheduledEvent:
+    """Handle of a callback scheduled on a `Scheduler`, `when` is a POSIX timestamp."""
+
+    def __init__(self, when: float, callback: Callable[[], Any]):
+        self.when = when
+        self.callback = callback
+        self.active = True
+        self.sequence = 0
+
+
+class Scheduler:
+    """Runs callbacks at a point in time from a single task. Events are kept in a heap on their deadline, the task
+    sleeps until the first one is due and then fires every event that is due in one batch. Callbacks returning a
+    coroutine have it queued as a task. Cancelled and rescheduled events are left in the heap and skipped when they
+    come up."""
+
+    def __init__(self, queue_task: Callable):
+        self.__queue_task = queue_task
+        self.__heap: list[tuple[float, int, ScheduledEvent]] = []
+        self.__sequence = itertools.count()
+        self.__task: Optional[asyncio.Task] = None
+        self.__wakeup: Optional[asyncio.Event] = None
+        self.queue_depth = 0
+        self.fired = 0
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        self.__drop_stale()
+        return self.__heap[0][0] if len(self.__heap) > 0 else None
+
+    def schedule(self, when: float, callback: Callable[[], Any]) -> ScheduledEvent:
+        event = ScheduledEvent(when, callback)
+        self.queue_depth += 1
+        self.__push(event)
+        return event
+
+    def reschedule(self, event: ScheduledEvent, when: float):
+        """Move an event to another time, events that already fired or were cancelled are scheduled again."""
+        if not event.active:
+            event.active = True
+            self.queue_depth += 1
+        event.when = when
+        self.__push(event)
+
+    def cancel(self, event: ScheduledEvent):
+        if event.active:
+            event.active = False
+            self.queue_depth -= 1
+
+    def __push(self, event: ScheduledEvent):
+        earliest = self.next_deadline
+        event.sequence = next(self.__sequence)
+        heapq.heappush(self.__heap, (event.when, event.sequence, event))
+
+        if self.__task is None:
+            self.__task = self.__queue_task(self.__run())
+        elif self.__wakeup is not None and (earliest is None or event.when < earliest):
+            self.__wakeup.set()
+
+    def __drop_stale(self):
+        while len(self.__heap) > 0 and not Scheduler.__current(self.__heap[0]):
+            heapq.heappop(self.__heap)
+
+    @staticmethod
+    def __current(entry: tuple[float, int, ScheduledEvent]) -> bool:
+        _, sequence, event = entry
+        return event.active and event.sequence == sequence
+
+    async def __run(self):
+        self.__wakeup = asyncio.Event()
+        try:
+            while self.next_deadline is not None:
+                delay = self.next_deadline - time.time()
+                if delay > 0:
+                    self.__wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self.__wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                self.__fire_due()
+        finally:
+            self.__task = None
+
+    def __fire_due(self):
+        now = time.time()
+        due = []
+        while len(self.__heap) > 0 and self.__heap[0][0] <= now:
+            entry = heapq.heappop(self.__heap)
+            if Scheduler.__current(entry):
+                entry[2].active = False
+                due.append(entry[2])
+
+        self.queue_depth -= len(due)
+        self.fired += len(due)
+        for event in due:
+            try:
+                result = event.callback()
+                if inspect.iscoroutine(result):
+                    self.__queue_task(result)
+            except Exception as error:
+                _log.error(f"Scheduled event {event.callback} failed due to {error}")
+                _log.exception(error)
@@ -18,6 +18,7 @@ class Scrim:
         self.settings: Optional[dict] = None
         self.__sync = sync
         self.__log = log
+        self.on_user_change: Optional[Callable[[int], None]] = None
 
         if "players" not in self.data:
             self.data["players"] = []
@@ -25,6 +26,9 @@ class Scrim:
         if "reserve" not in self.data:
             self.data["reserve"] = []
 
+        self.__players = scrimbot.Roster(self.data["players"])
+        self.__reserves = scrimbot.Roster(self.data["reserve"])
+
     @property
     def size(self):
         return self.__size if self.__size is not None else self.settings["size"]
@@ -40,11 +44,11 @@ class Scrim:
 
     @property
     def num_players(self):
-        return len(self.data["players"])
+        return len(self.__players)
 
     @property
     def num_reserves(self):
-        return len(self.data["reserve"])
+        return len(self.__reserves)
 
     @property
     def full(self) -> bool:
@@ -76,6 +80,18 @@ class Scrim:
     def players(self):
         return self.data["players"]
 
+    @property
+    def users(self) -> list[int]:
+        return [u["id"] for u in self.__players] + [u["id"] for u in self.__reserves]
+
+    def __users_changed(self, *users: int):
+        if len(users) == 0:
+            return
+        self.__sync()
+        if self.on_user_change is not None:
+            for user in users:
+                self.on_user_change(user)
+
     def get_next_reserve(self):
         for r in self.data["reserve"]:
             if "called" not in r:
@@ -93,62 +109,44 @@ class Scrim:
         return self.contains_player(user) or self.contains_reserve(user)
 
     def contains_player(self, user: int) -> bool:
-        return any(u["id"] == user for u in self.data["players"])
+        return user in self.__players
 
     def contains_reserve(self, user: int) -> bool:
-        return any(u["id"] == user for u in self.data["reserve"])
+        return user in self.__reserves
 
     def add_player(self, player):
-        self.data["players"].append(player)
-        self.__sync()
-        self.remove_reserve(player["id"])
+        self.__reserves.remove(player["id"])
+        self.__players.add(player)
+        self.__users_changed(player["id"])
 
     def remove_player(self, player_id):
-        self.__remove_from_playerlist("players", player_id)
-        if not self.full:
-            auto = None
-            for r in self.data["reserve"]:
-                if "auto" in r:
-                    auto = r
-                    break
-
-            if auto is not None:
-                if "auto" in auto:
-                    del auto["auto"]
-                self.add_player(auto)
-                return auto
+        removed = self.__players.remove(player_id)
+        auto = self.__promote_auto_join()
+        self.__users_changed(*[u["id"] for u in [removed, auto] if u is not None])
+        return auto
 
     def add_reserve(self, reserve):
-        self.data["reserve"].append(reserve)
-        self.__sync()
-        self.remove_player(reserve["id"])
+        self.__players.remove(reserve["id"])
+        self.__reserves.add(reserve)
+        auto = self.__promote_auto_join()
+        self.__users_changed(*[u["id"] for u in [reserve, auto] if u is not None])
 
     def remove_reserve(self, player_id):
-        self.__remove_from_playerlist("reserve", player_id)
-
-    def set_auto_join(self, user, auto=True):
-        for player in self.data["reserve"]:
-            if player["id"] == user:
-                if auto:
-                    player["auto"] = True
-                elif "auto" in player:
-                    del player["auto"]
-                self.__sync()
-                break
-
-    def __remove_from_playerlist(self, playerlist, player_id):
-        if playerlist not in self.data:
-            return
+        if self.__reserves.remove(player_id) is not None:
+            self.__users_changed(player_id)
 
-        player = None
-
-        for x in self.data[playerlist]:
-            if x["id"] == player_id:
-                player = x
-                break
+    def __promote_auto_join(self) -> Optional[dict]:
+        if self.full:
+            return None
+        auto = self.__reserves.next_auto()
+        if auto is not None:
+            del auto["auto"]
+            self.__reserves.remove(auto["id"])
+            self.__players.add(auto)
+        return auto
 
-        if player:
-            self.data[playerlist].remove(player)
+    def set_auto_join(self, user, auto=True):
+        if self.__reserves.set_auto(user, auto):
             self.__sync()
 
     def generate_header_message(self) -> str:
@@ -162,7 +160,7 @@ class Scrim:
                f"started by {tag.user(self.author['id'])}"
 
     def generate_player_list(self, separator="\n") -> str:
-        return separator.join(map(lambda p: p['mention'], self.data["players"]))
+        return separator.join(map(lambda p: p['mention'], self.__players))
 
     def generate_reserve_list(self, separator="\n") -> str:
         def __map_reserve(reserve: dict):
@@ -172,7 +170,7 @@ class Scrim:
                 return f"{reserve['mention']} (called)"
             return reserve['mention']
 
-        return separator.join(map(__map_reserve, self.data["reserve"]))
+        return separator.join(map(__map_reserve, self.__reserves))
 
     def generate_start_messages(self) -> tuple[str, Optional[str]]:
         if self.num_players == 0:
@@ -1,6 +1,7 @@
 import asyncio
+import hashlib
+import json
 import logging
-import math
 from datetime import datetime, timedelta
 from typing import Optional, Callable
 
@@ -17,7 +18,8 @@ class ScrimManager:
     __KILL_CODES = {50083, 10003, 10008}
 
     def __init__(self, *, scrim: scrimbot.Scrim, update_broadcasts: Callable, queue_task: Callable,
-                 remove: Callable, bot: discord.Bot, timeout_check: Callable[[discord.Member], bool]):
+                 remove: Callable, bot: discord.Bot, timeout_check: Callable[[discord.Member], bool],
+                 render_interval: float = 2.0):
         self.scrim: scrimbot.Scrim = scrim
         self.__bot = bot
         self.__update_broadcasts = update_broadcasts
@@ -32,6 +34,11 @@ class ScrimManager:
         self.last_ping = datetime.now(tz=scrim.timezone) - timedelta(hours=1)
 
         self.__view: Optional[discord.ui.View] = None
+        self.renders = scrimbot.Debouncer(self.__render, queue_task, interval=render_interval)
+        self.skipped_edits = 0
+        self.__fingerprints: dict[str, str] = {}
+        self.__start_event: Optional[scrimbot.ScheduledEvent] = None
+        self.__archive_event: Optional[scrimbot.ScheduledEvent] = None
 
         async def fetch_thread() -> discord.Thread:
             return await bot.fetch_channel(self.id)
@@ -50,8 +57,9 @@ class ScrimManager:
         self.__view = scrimbot.ScrimView(self)
         await self.__thread.fetch()
 
-        self.__queue_task(self.__start_scrim())
-        self.__queue_task(self.__update())
+        if self.__start_event is None:
+            self.__start_event = self.__bot.scheduler.schedule(self.scrim.time.timestamp(), self.__start_scrim)
+        self.renders.request()
 
     async def __on_thread_fetched(self, thread: discord.Thread):
         scrim_channel: discord.TextChannel = thread.parent
@@ -62,53 +70,75 @@ class ScrimManager:
     async def __on_content_message_fetched(self, message: discord.Message):
         self.url = message.jump_url
 
-    async def __update(self):
-        async def internal():
-            if await self.__thread.fetch() and self.__thread.content.archived:
-                await self.__end()
-                return
+    async def __render(self):
+        await self.__render_messages()
+        self.__update_broadcasts()
+
+    async def __render_messages(self):
+        if await self.__thread.fetch() and self.__thread.content.archived:
+            await self.__end()
+            return
+
+        if self.scrim.time < datetime.now(self.scrim.timezone) - timedelta(hours=2):
+            self.__view = None
 
-            if self.scrim.time < datetime.now(self.scrim.timezone) - timedelta(hours=2):
+        elif (self.scrim.time < datetime.now(self.scrim.timezone) or self.scrim.started) and \
+                hasattr(self.__view, "use") and self.__view.use == "before":
+            if self.scrim.num_players > 0:
+                self.__view = scrimbot.ScrimRunningView(self)
+            else:
                 self.__view = None
 
-            elif (self.scrim.time < datetime.now(self.scrim.timezone) or self.scrim.started) and \
-                    hasattr(self.__view, "use") and self.__view.use == "before":
-                if self.scrim.num_players > 0:
-                    self.__view = scrimbot.ScrimRunningView(self)
-                else:
-                    self.__view = None
+        profiles: scrimbot.OculusProfiles = self.__bot.oculus_profiles
 
-            profiles: scrimbot.OculusProfiles = self.__bot.oculus_profiles
+        embeds = [self.create_rich_embed()]
 
-            embeds = [self.create_rich_embed()]
+        for p in self.scrim.players[:9]:
+            embed = await profiles.get_embed(p['id'], long=False)
+            if embed is not None:
+                embeds.append(embed)
 
-            for p in self.scrim.players[:9]:
-                embed = await profiles.get_embed(p['id'], long=False)
-                if embed is not None:
-                    embeds.append(embed)
+        await asyncio.gather(
+            self.__edit("content", self.id, self.__content_message, content="", embeds=embeds, view=self.__view),
+            self.__edit("start", self.scrim.scrim_channel, self.__start_message,
+                        content=self.scrim.generate_header_message()))
 
-            await self.__content_message.wait(
-                lambda m: m.edit(content="", embeds=embeds, view=self.__view))
-            await self.__start_message.wait(
-                lambda m: m.edit(content=self.scrim.generate_header_message()))
+        if self.scrim.time < datetime.now(self.scrim.timezone) - timedelta(hours=2):
+            await self.__end()
 
-            if self.scrim.time < datetime.now(self.scrim.timezone) - timedelta(hours=2):
-                await self.__end()
+        if self.scrim.started and self.scrim.num_players == 0:
+            await self.__end()
 
-            if self.scrim.started and self.scrim.num_players == 0:
-                await self.__end()
+    async def __edit(self, name: str, channel: int, message: DiscordProxy[discord.Message], **fields):
+        """Edit a message unless it already shows exactly these fields, edits wait for the bot wide rate limiter."""
+        limiter: scrimbot.RateLimiter = self.__bot.rate_limiter
+        rendered = fingerprint(fields)
+        if self.__fingerprints.get(name, None) == rendered:
+            self.skipped_edits += 1
+            limiter.discard((self.id, name))
+            return
 
-        self.__queue_task(internal())
-        self.__update_broadcasts()
+        async def edit():
+            if await message.wait(lambda m: m.edit(**fields)) is not None:
+                self.__fingerprints[name] = rendered
+
+        await limiter.submit(channel, (self.id, name), edit)
 
     async def __end(self):
         self.__thread.error_handler = scrimbot.DiscordProxy.error_handler_silent  # To prevent loops
         self.__start_message.error_handler = scrimbot.DiscordProxy.error_handler_silent
         self.__content_message.error_handler = scrimbot.DiscordProxy.error_handler_silent
+        self.close()
         await self.__thread.wait(lambda t: t.edit(archived=True))
         self.__remove(self)
         self.__update_broadcasts()
 
+    def close(self):
+        """Cancel the scheduled start and archive of the scrim."""
+        for event in [self.__start_event, self.__archive_event]:
+            if event is not None:
+                self.__bot.scheduler.cancel(event)
+
     def __handle_error(self, error: discord.HTTPException):
         if error.code in ScrimManager.__KILL_CODES:
             _log.info(f"Removing scrim {self.id} because of {error}")
@@ -159,14 +189,14 @@ class ScrimManager:
         if not self.scrim.full:
             if not self.scrim.contains_player(user.id):
                 self.scrim.add_player(user_dict(user))
-                self.__queue_task(self.__update())
+                self.renders.request()
                 return "Added you to the scrim."
             else:
                 return "Whoops, you are already in there!"
         else:
             await self.reserve(user)
             self.scrim.set_auto_join(user.id)
-            self.__queue_task(self.__update())
+            self.renders.request()
             return "It's full, sorry! I put you on the reserve on auto-join, if a spot opens up the first reserve on " \
                    "auto-join will get it. If you don't want auto-join just press the **reserve** button."
 
@@ -181,7 +211,7 @@ class ScrimManager:
 
         if not self.scrim.contains_reserve(user.id):
             self.scrim.add_reserve(user_dict(user))
-            self.__queue_task(self.__update())
+            self.renders.request()
             if self.scrim.full:
                 return "Put you on the reserve list, if you would like to join as soon as a spot opens up click " \
                        "**join** to turn on auto-join. If a spot opens up the first reserve on auto-join will " \
@@ -189,13 +219,13 @@ class ScrimManager:
             return "Put you on the reserve list."
         else:
             self.scrim.set_auto_join(user.id, False)
-            self.__queue_task(self.__update())
+            self.renders.request()
             return "You are already a reserve, turned off auto-join if it was on."
 
     async def leave(self, user: discord.Member):
         added = self.scrim.remove_player(user.id)
         self.scrim.remove_reserve(user.id)
-        self.__queue_task(self.__update())
+        self.renders.request()
         if added is not None:
             await self.__thread.wait(
                 lambda t: t.send(f"Hey {added['mention']}, you got automatically added to the scrim!"))
@@ -204,7 +234,7 @@ class ScrimManager:
         reserve = self.scrim.call_next_reserve()
         if reserve is None:
             return "No reserve available", True
-        self.__queue_task(self.__update())
+        self.renders.request()
         return f"{tag.user(reserve['id'])} you are needed! Get online if you can!", False
 
     def contains_player(self, user: int) -> bool:
@@ -214,11 +244,6 @@ class ScrimManager:
         return self.scrim.contains_user(user.id)
 
     async def __start_scrim(self):
-        now = datetime.now(self.scrim.timezone)
-        if self.scrim.time > now:
-            seconds = math.floor((self.scrim.time - now).total_seconds())
-            await asyncio.sleep(seconds)
-
         if not self.scrim.started:
             thread_msg, channel_msg = self.scrim.generate_start_messages()
             await self.__thread.wait(lambda t: t.send(thread_msg))
@@ -227,15 +252,11 @@ class ScrimManager:
             self.scrim.started = True
             self.scrim.log_scrimmers()
 
-        self.__queue_task(self.__update())
-
-        now = datetime.now(self.scrim.timezone)
-        archive_time = self.scrim.time + timedelta(hours=2, minutes=5)
-        if archive_time > now:
-            seconds = math.floor((archive_time - now).total_seconds())
-            await asyncio.sleep(seconds)
+        self.renders.request()
 
-        self.__queue_task(self.__update())
+        if self.__archive_event is None:
+            archive_time = self.scrim.time + timedelta(hours=2, minutes=5)
+            self.__archive_event = self.__bot.scheduler.schedule(archive_time.timestamp(), self.renders.request)
 
     def ping(self, text, user) -> tuple[str, bool]:
         now = datetime.now(utc)
@@ -250,5 +271,17 @@ class ScrimManager:
         return f"{players}, You have been pinged by {tag.user(user)}!\n{text}", False
 
 
+def fingerprint(fields: dict) -> str:
+    """Hash of the fields of a message edit, embeds and views are compared by their rendered form."""
+    def render(value):
+        if isinstance(value, discord.Embed):
+            return value.to_dict()
+        if isinstance(value, discord.ui.View):
+            return value.to_components()
+        return repr(value)
+
+    return hashlib.sha256(json.dumps(fields, default=render, sort_keys=True).encode()).hexdigest()
+
+
 def user_dict(user: discord.Member) -> dict:
     return {"id": user.id, "name": user.display_name, "mention": user.mention}
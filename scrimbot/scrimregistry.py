@@ -0,0 +1,84 @@
+import math
+from collections import defaultdict
+from typing import Optional, Iterator
+
+import scrimbot
+from scrimbot.timeindex import TimeIndex
+
+
+class ScrimRegistry:
+    """The scrim managers of a guild keyed by thread id, with time ordered views of all scrims and of the scrims per
+    scrim channel and per broadcast channel.
+    `data` is the list of scrim dicts persisted by the guild's scrim store. Removing a scrim moves the last one into its
+    slot, so the order of that list is not kept."""
+
+    def __init__(self, data: list[dict]):
+        self.data = data
+        self.__positions: dict[int, int] = {d["thread"]: i for i, d in enumerate(data)}
+        self.__managers: dict[int, scrimbot.ScrimManager] = {}
+        self.__by_time: TimeIndex[scrimbot.ScrimManager] = TimeIndex()
+        self.__by_channel: dict[int, TimeIndex[scrimbot.ScrimManager]] = defaultdict(TimeIndex)
+        self.__by_broadcast: dict[int, TimeIndex[scrimbot.ScrimManager]] = defaultdict(TimeIndex)
+        self.__keys: dict[int, tuple[int, int]] = {}
+
+    def __iter__(self) -> Iterator[scrimbot.ScrimManager]:
+        return iter(list(self.__managers.values()))
+
+    def __len__(self):
+        return len(self.__managers)
+
+    def __contains__(self, scrim_manager: scrimbot.ScrimManager):
+        return self.__managers.get(scrim_manager.id, None) is scrim_manager
+
+    def add(self, scrim_manager: scrimbot.ScrimManager):
+        if scrim_manager.id in self.__managers:
+            self.remove(self.__managers[scrim_manager.id])
+
+        channel, broadcast = scrim_manager.scrim.scrim_channel, scrim_manager.broadcast
+        time = scrim_manager.scrim.time.timestamp()
+        self.__managers[scrim_manager.id] = scrim_manager
+        self.__keys[scrim_manager.id] = (channel, broadcast)
+        self.__by_time.add(scrim_manager.id, time, scrim_manager)
+        self.__by_channel[channel].add(scrim_manager.id, time, scrim_manager)
+        self.__by_broadcast[broadcast].add(scrim_manager.id, time, scrim_manager)
+
+        if scrim_manager.id not in self.__positions:
+            self.__positions[scrim_manager.id] = len(self.data)
+            self.data.append(scrim_manager.scrim.data)
+
+    def remove(self, scrim_manager: scrimbot.ScrimManager) -> bool:
+        if scrim_manager not in self:
+            return False
+
+        del self.__managers[scrim_manager.id]
+        channel, broadcast = self.__keys.pop(scrim_manager.id)
+        self.__by_time.remove(scrim_manager.id)
+        self.__discard(self.__by_channel, channel, scrim_manager.id)
+        self.__discard(self.__by_broadcast, broadcast, scrim_manager.id)
+
+        position = self.__positions.pop(scrim_manager.id)
+        last = self.data.pop()
+        if position < len(self.data):
+            self.data[position] = last
+            self.__positions[last["thread"]] = position
+        return True
+
+    @staticmethod
+    def __discard(view: dict[int, TimeIndex[scrimbot.ScrimManager]], key: int, scrim_id: int):
+        view[key].remove(scrim_id)
+        if len(view[key]) == 0:
+            del view[key]
+
+    def get(self, scrim_id: int) -> Optional[scrimbot.ScrimManager]:
+        return self.__managers.get(scrim_id, None)
+
+    def between(self, start: float = -math.inf, end: float = math.inf) -> list[scrimbot.ScrimManager]:
+        return self.__by_time.between(start, end)
+
+    def in_channel(self, channel: int, start: float = -math.inf, end: float = math.inf) \
+            -> list[scrimbot.ScrimManager]:
+        return self.__by_channel[channel].between(start, end) if channel in self.__by_channel else []
+
+    def for_broadcast(self, channel: int, start: float = -math.inf, end: float = math.inf) \
+            -> list[scrimbot.ScrimManager]:
+        return self.__by_broadcast[channel].between(start, end) if channel in self.__by_broadcast else []
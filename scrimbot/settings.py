@@ -1,4 +1,4 @@
-from typing import Type, Callable
+from typing import Type, Callable, Optional
 
 import pytz
 
@@ -77,6 +77,7 @@ class Settings:
         self.__roles = roles
         self.__channels = channels
         self.__settings: scrimbot.Store[dict] = settings_store
+        self.__resolved: Optional[dict] = None
 
     @property
     def __template(self):
@@ -184,26 +185,28 @@ class Settings:
         self.__settings.data.clear()
         self.__settings.data.update(new_data)
         self.__settings.sync()
+        self.__resolved = None
+
+    @property
+    def __compiled(self) -> dict:
+        if self.__resolved is None:
+            data = self.combined(self.__settings.data)
+            self.__flatten(data, use_defaults=True)
+            self.__resolved = data
+        return self.__resolved
 
     @property
     def server(self) -> dict:
-        data = self.combined(self.__settings.data)
-        self.__flatten(data, use_defaults=True)
-        return data["server"]
+        return self.__compiled["server"]
 
     def channel(self, channel: int) -> dict:
-        data = self.combined(self.__settings.data)
-        self.__flatten(data, use_defaults=True)
+        data = self.__compiled
         return data.get('channel', {}).get(str(channel), data["channel_defaults"])
 
     @property
     def channels(self) -> dict:
-        data = self.combined(self.__settings.data)
-        self.__flatten(data, use_defaults=True)
-        return data.get('channel', {})
+        return self.__compiled.get('channel', {})
 
     @property
     def channel_defaults(self) -> dict:
-        data = self.combined(self.__settings.data)
-        self.__flatten(data, use_defaults=True)
-        return data["channel_defaults"]
+        return self.__compiled["channel_defaults"]
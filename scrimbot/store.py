@@ -1,22 +1,86 @@
+import asyncio
 import json
+import logging
 import os
-from typing import Generic, TypeVar
+import tempfile
+import threading
+from typing import Generic, TypeVar, Callable, Optional, Any
 
 T = TypeVar('T')
 
+_log = logging.getLogger(__name__)
+
+
+def write_atomically(file: str, content: str):
+    """Replace `file` with `content` through a synced temporary file, a crash leaves either the old or the new file."""
+    directory = os.path.dirname(file) or "."
+    fd, temp_file = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_file, file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+
+class Flusher:
+    """Calls `flush` every `interval` seconds from a task for as long as `dirty` holds. A failed flush is logged and
+    stops the task, the next `schedule()` starts it again."""
+
+    def __init__(self, name: str, dirty: Callable[[], bool], flush: Callable, queue_task: Optional[Callable],
+                 interval: float):
+        self.__name = name
+        self.__dirty = dirty
+        self.__flush = flush
+        self.__queue_task = queue_task
+        self.__interval = interval
+        self.__task: Optional[asyncio.Task] = None
+
+    def schedule(self):
+        if self.__task is None:
+            self.__task = self.__queue_task(self.__run())
+
+    async def __run(self):
+        try:
+            while self.__dirty():
+                await asyncio.sleep(self.__interval)
+                await self.__flush()
+        except Exception as error:
+            _log.error(f"Unable to write '{self.__name}' due to {error}")
+            _log.exception(error)
+        finally:
+            self.__task = None
+
 
 class Store(Generic[T]):
+    """JSON file backed data. With a `queue_task` the store runs in dirty-flag mode: `mark_dirty()` merges bursts of
+    changes into at most one write per `interval` seconds, without one it writes on every change."""
 
-    def __init__(self, file: str, empty: T):
+    def __init__(self, file: str, empty: T, queue_task: Optional[Callable] = None, interval: float = 2.0):
         self.__file = file
         self.__empty = empty
-        self.data: T = self.__load()
+        self.__queue_task = queue_task
+        self.__dirty = False
+        self.__flusher = Flusher(file, lambda: self.__dirty, self.flush_async, queue_task, interval)
+        self.__write_lock = threading.Lock()
+        self.__snapshots = 0
+        self.__written = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.data: T = self._load()
 
     @property
     def file(self):
         return self.__file
 
-    def __load(self) -> T:
+    @property
+    def dirty(self) -> bool:
+        return self.__dirty
+
+    def _load(self) -> T:
         try:
             with open(self.__file, 'r') as file:
                 return json.load(file)
@@ -27,6 +91,55 @@ class Store(Generic[T]):
             os.rename(self.__file, f"{self.__file}.bad")
             return self.__empty
 
+    def mark_dirty(self):
+        if self.__queue_task is None:
+            self.sync()
+            return
+
+        if self.__dirty:
+            self.coalesced += 1
+
+        self.__dirty = True
+        self.__flusher.schedule()
+
+    def flush(self):
+        """Write pending changes right away, used on shutdown."""
+        if self.__dirty:
+            self.sync()
+
+    async def flush_async(self):
+        """Write pending changes from a worker thread, only the serialization runs on the event loop."""
+        if not self.__dirty:
+            return
+
+        snapshot = self.__snapshot()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.__write, snapshot)
+        except Exception:
+            self.__dirty = True
+            raise
+
     def sync(self):
-        with open(self.__file, 'w') as jsonfile:
-            json.dump(self.data, jsonfile, indent=4)
+        self.__write(self.__snapshot())
+
+    def __snapshot(self) -> tuple[int, Any]:
+        self.__dirty = False
+        self.__snapshots += 1
+        return self.__snapshots, self._serialize()
+
+    def __write(self, snapshot: tuple[int, Any]):
+        number, content = snapshot
+        with self.__write_lock:
+            # A newer snapshot may have been written synchronously while this one waited for a worker thread
+            if number <= self.__written:
+                return
+
+            self._write(content)
+            self.__written = number
+            self.writes += 1
+
+    def _serialize(self) -> Any:
+        return json.dumps(self.data, indent=4)
+
+    def _write(self, content: Any):
+        write_atomically(self.__file, content)
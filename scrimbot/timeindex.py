@@ -0,0 +1,43 @@
+import bisect
+import math
+from typing import Generic, TypeVar, Optional, Iterator
+
+T = TypeVar('T')
+
+
+class TimeIndex(Generic[T]):
+    """Items ordered by a timestamp, so the items in any window of time are found with a binary search. Items are
+    identified by an integer id and are in the index at most once."""
+
+    def __init__(self):
+        self.__keys: list[tuple[float, int]] = []
+        self.__items: dict[int, T] = {}
+        self.__times: dict[int, float] = {}
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter([self.__items[id] for _, id in self.__keys])
+
+    def __contains__(self, id: int):
+        return id in self.__items
+
+    def add(self, id: int, time: float, item: T):
+        if id in self.__items:
+            self.remove(id)
+        bisect.insort(self.__keys, (time, id))
+        self.__items[id] = item
+        self.__times[id] = time
+
+    def remove(self, id: int) -> Optional[T]:
+        if id not in self.__items:
+            return None
+        del self.__keys[bisect.bisect_left(self.__keys, (self.__times.pop(id), id))]
+        return self.__items.pop(id)
+
+    def between(self, start: float = -math.inf, end: float = math.inf) -> list[T]:
+        """Items with a time strictly between `start` and `end`, ordered by time."""
+        low = bisect.bisect_right(self.__keys, (start, math.inf))
+        high = bisect.bisect_left(self.__keys, (end, -math.inf))
+        return [self.__items[id] for _, id in self.__keys[low:high]]
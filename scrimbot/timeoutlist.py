@@ -1,74 +1,126 @@
-import asyncio
+import heapq
 from collections import namedtuple
 from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import scrimbot
 
 
 class TimeoutList:
-    """List to keep track of the users in timeout. Users are represented 
-    as `NamedTuple` with id, timeout and runout_task."""
-    User = namedtuple("User",
-                      ["id", "timeout", "runout_task"],
-                      defaults=[None])
+    """Keeps track of the users in timeout, keyed by user id. Users are
+    represented as `NamedTuple` with id and timeout. Expiries are kept in a
+    min-heap with a single scheduled event for the earliest one, entries of
+    users that were removed or timed out again are skipped when they come up.
+    The stored list is updated in place, a removed entry is replaced by the
+    last one."""
+    User = namedtuple("User", ["id", "timeout"])
 
     def __init__(self, guild, store):
         self.guild = guild
         self.loop = guild.bot.loop
         self._store = store
-        self._timeouts = []
+        self._timeouts: dict[int, TimeoutList.User] = {}
+        self._expiry: Optional[scrimbot.ScheduledEvent] = None
+
+        for u in store.data:
+            self._timeouts[u["user_id"]] = self.User(u["user_id"], datetime.fromtimestamp(u["timeout"], timezone.utc))
+        if len(self._timeouts) < len(store.data):
+            # Users could end up in the store twice before, keep the last entry
+            store.data = list({"user_id": u.id, "timeout": u.timeout.timestamp()} for u in self._timeouts.values())
+            store.mark_dirty()
+
+        self._positions = {u["user_id"]: i for i, u in enumerate(store.data)}
+        self._expiries = list((u.timeout.timestamp(), u.id) for u in self._timeouts.values())
+        heapq.heapify(self._expiries)
 
     async def init(self):
-        for u in self._store.data:
-            task = self.loop.create_task(self._timeout_countdown(u["user_id"]))
-            self._timeouts.append(
-                self.User(u["user_id"],
-                          datetime.fromtimestamp(u["timeout"], timezone.utc),
-                          task)
-            )
+        self._schedule()
 
-    def contains_user(self, user_id):
-        return any(u.id == user_id for u in self._timeouts)
+    def close(self):
+        """Stop the scheduled expiry, for a guild that is given up on."""
+        if self._expiry is not None:
+            self.guild.bot.scheduler.cancel(self._expiry)
 
-    async def _timeout_countdown(self, user_id):
-        user = self._get_user_from_id(user_id)
-        timeout_left = user.timeout - datetime.now(tz=timezone.utc)
-        await asyncio.sleep(timeout_left.total_seconds())
-        self.remove_user(user.id)
+    def contains_user(self, user_id):
+        return user_id in self._timeouts
+
+    def user_ids(self) -> list[int]:
+        return list(self._timeouts.keys())
+
+    def _current(self, expiry: tuple[float, int]) -> bool:
+        timeout, user_id = expiry
+        user = self._timeouts.get(user_id, None)
+        return user is not None and user.timeout.timestamp() == timeout
+
+    def _schedule(self):
+        """Point the scheduled event at the earliest expiry."""
+        while self._expiries and not self._current(self._expiries[0]):
+            heapq.heappop(self._expiries)
+
+        scheduler: scrimbot.Scheduler = self.guild.bot.scheduler
+        if not self._expiries:
+            if self._expiry is not None:
+                scheduler.cancel(self._expiry)
+            return
+
+        timeout = self._expiries[0][0]
+        if self._expiry is None:
+            self._expiry = scheduler.schedule(timeout, self._expire)
+        elif not self._expiry.active or self._expiry.when != timeout:
+            scheduler.reschedule(self._expiry, timeout)
+
+    def _expire(self):
+        now = datetime.now(tz=timezone.utc).timestamp()
+        expired = []
+        while self._expiries and self._expiries[0][0] <= now:
+            expiry = heapq.heappop(self._expiries)
+            if self._current(expiry):
+                expired.append(expiry[1])
+
+        for user_id in expired:
+            self.remove_user(user_id)
+        self._schedule()
 
     async def _remove_user_from_scrims(self, user_id):
         user = self._get_user_from_id(user_id)
-        for scrim_mgr in self.guild.scrim_managers:
-            if scrim_mgr.scrim.time > user.timeout:
-                continue
-            await scrim_mgr.leave(user)
-
-    def _sync(self):
-        self._store.data = self._to_list()
-        self.guild.queue_callable(self._store.sync)()
-
-    def _to_list(self):
-        return list({"user_id": u.id,
-                     "timeout": u.timeout.timestamp()} for u in self._timeouts)
+        for scrim_mgr in self.guild.bot.player_index.scrims(user_id, end=user.timeout.timestamp()):
+            if scrim_mgr in self.guild.scrim_managers:
+                await scrim_mgr.leave(user)
 
     def _get_user_from_id(self, user_id):
-        user = next((u for u in self._timeouts if u.id == user_id), None)
-        return user
+        return self._timeouts.get(user_id, None)
+
+    def _remove(self, user_id):
+        del self._timeouts[user_id]
+        position = self._positions.pop(user_id)
+        last = self._store.data.pop()
+        if position < len(self._store.data):
+            self._store.data[position] = last
+            self._positions[last["user_id"]] = position
 
     def add_user(self, user_id, duration, reason):
         self.loop.create_task(self._add_role(user_id, reason))
-        self.loop.create_task(self._remove_user_from_scrims(user_id))
-        task = self.loop.create_task(self._timeout_countdown(user_id))
 
-        u = self.User(user_id, datetime.now(tz=timezone.utc) + duration, task)
-        self._timeouts.append(u)
-        self._sync()
+        if user_id in self._timeouts:
+            self._remove(user_id)
+
+        u = self.User(user_id, datetime.now(tz=timezone.utc) + duration)
+        self._timeouts[user_id] = u
+        self._positions[user_id] = len(self._store.data)
+        self._store.data.append({"user_id": u.id, "timeout": u.timeout.timestamp()})
+        heapq.heappush(self._expiries, (u.timeout.timestamp(), user_id))
+        self._store.mark_dirty()
+        self._schedule()
+
+        self.loop.create_task(self._remove_user_from_scrims(user_id))
 
     def remove_user(self, user_id, reason=None):
         self.loop.create_task(self._remove_role(user_id, reason))
-        user = self._get_user_from_id(user_id)
-        user_index = self._timeouts.index(user)
-        del self._timeouts[user_index]
-        self._sync()
-        user.runout_task.cancel()
+        if user_id not in self._timeouts:
+            raise ValueError(f"User {user_id} is not on timeout")
+        self._remove(user_id)
+        self._store.mark_dirty()
+        self._schedule()
 
     def time_remaining(self, user_id):
         """Get remaining timeout for a user truncated after seconds or None."""
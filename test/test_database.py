@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import patch
+
+from scrimbot import Database, SqliteLog, SqliteStore
+from scrimbot.database import migrate
+
+
+class DatabaseTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name, data):
+        with open(os.path.join(self.dir.name, name), 'w') as file:
+            json.dump(data, file)
+
+    def test_migrate(self):
+        now = datetime.now(timezone.utc).timestamp()
+        self.write("42-log.json", [
+            {"id": "a", "user": 1, "time": now, "text": "", "author": 2, "type": "warning"},
+            {"id": "b", "user": 1, "time": now, "text": "", "author": 0, "type": "scrim"},
+            {"id": "c", "user": 3, "time": now, "text": "", "author": 1, "type": "report", "channel": 5}])
+        self.write("42-scrims.json", [{"thread": 7, "time": now, "players": []}])
+        self.write("42-timeouts.json", [{"user_id": 1, "timeout": now}])
+
+        database = migrate("42", self.dir.name)
+        log = SqliteLog(database, lambda user: {"name": f"player{user}"})
+
+        self.assertEqual(1, log.warning_count(1))
+        self.assertEqual(1, log.weekly_warning_count(1))
+        self.assertEqual(1, log.scrim_count(1))
+        self.assertEqual(1, log.daily_report_count(1))
+        self.assertEqual(["<@1> 1/1"], log.print_warning_top())
+        self.assertEqual(["<@1> player1 1"], log.print_scrim_top())
+        self.assertEqual(["<@1> player1 1"], log.print_scrim_top(period="Week", limit=1))
+        self.assertEqual([{"thread": 7, "time": now, "players": []}],
+                         SqliteStore(database, "scrims", "thread", "time").data)
+        self.assertEqual([{"user_id": 1, "timeout": now}],
+                         SqliteStore(database, "timeouts", "user_id", "timeout").data)
+        self.assertFalse(os.path.exists(os.path.join(self.dir.name, "42-scrims.json")))
+
+    def test_migrate_with_corrupt_legacy_log(self):
+        now = datetime.now(timezone.utc).timestamp()
+        with open(os.path.join(self.dir.name, "42-log.json"), 'w') as file:
+            file.write('[{"id": "a", "us')
+        self.write("42-scrims.json", [{"thread": 7, "time": now, "players": []}])
+        self.write("42-timeouts.json", [{"user_id": 1, "timeout": now}])
+
+        database = Database.for_guild("42", self.dir.name)
+
+        self.assertEqual(0, SqliteLog(database, lambda user: {}).warning_count(1))
+        self.assertEqual([{"thread": 7, "time": now, "players": []}],
+                         SqliteStore(database, "scrims", "thread", "time").data)
+        self.assertEqual([{"user_id": 1, "timeout": now}],
+                         SqliteStore(database, "timeouts", "user_id", "timeout").data)
+        self.assertTrue(os.path.exists(os.path.join(self.dir.name, "42-log.json.bad")))
+        self.assertTrue(os.path.exists(os.path.join(self.dir.name, "42-timeouts.json.migrated")))
+
+    def test_failed_migration_is_retried(self):
+        now = datetime.now(timezone.utc).timestamp()
+        self.write("42-scrims.json", [{"thread": 7, "time": now, "players": []}])
+
+        with patch("scrimbot.SqliteStore.sync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                Database.for_guild("42", self.dir.name)
+
+        self.assertFalse(os.path.exists(os.path.join(self.dir.name, "42.sqlite3")))
+        self.assertTrue(os.path.exists(os.path.join(self.dir.name, "42-scrims.json")))
+
+        database = Database.for_guild("42", self.dir.name)
+        self.assertEqual([{"thread": 7, "time": now, "players": []}],
+                         SqliteStore(database, "scrims", "thread", "time").data)
+
+    def test_log_remove(self):
+        log = SqliteLog(Database(os.path.join(self.dir.name, "test.sqlite3")), lambda user: {})
+        log.add_warning(1, 2, "first")
+        log.add_note(1, 2, "second")
+
+        removed = log.remove(lambda entry: entry["type"] == "warning")
+
+        self.assertEqual(1, removed)
+        self.assertEqual(0, log.warning_count(1))
+        self.assertEqual(1, len(log.print_log(1, types=SqliteLog.ALL)))
+        self.assertEqual(1, log.remove_user(1))
+        self.assertEqual(0, log.remove_id("unknown"))
+
+    def test_store_writes_changes(self):
+        database = Database(os.path.join(self.dir.name, "test.sqlite3"))
+        store = SqliteStore(database, "scrims", "thread", "time")
+        store.data.append({"thread": 1, "time": 10})
+        store.data.append({"thread": 2, "time": 20})
+        store.sync()
+
+        del store.data[0]
+        store.data[0]["started"] = True
+        store.sync()
+
+        self.assertEqual([{"thread": 2, "time": 20, "started": True}],
+                         SqliteStore(database, "scrims", "thread", "time").data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from scrimbot import Debouncer
+
+
+class DebouncerTests(IsolatedAsyncioTestCase):
+
+    async def test_burst_is_merged(self):
+        runs = []
+
+        async def action():
+            runs.append(len(runs))
+
+        debouncer = Debouncer(action, asyncio.get_running_loop().create_task, interval=0.05)
+
+        for _ in range(8):
+            debouncer.request()
+        await asyncio.sleep(0.01)
+        debouncer.request()
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(9, debouncer.requested)
+        self.assertEqual(2, debouncer.performed)
+        self.assertEqual([0, 1], runs)
+
+    async def test_request_during_run_is_followed_by_a_run(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        runs = []
+
+        async def action():
+            runs.append(len(runs))
+            started.set()
+            await release.wait()
+
+        debouncer = Debouncer(action, asyncio.get_running_loop().create_task, interval=0)
+
+        debouncer.request()
+        await started.wait()
+        debouncer.request()
+        release.set()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(2, debouncer.performed)
+
+    async def test_failing_action_does_not_stop_later_runs(self):
+        async def action():
+            raise RuntimeError("broken")
+
+        debouncer = Debouncer(action, asyncio.get_running_loop().create_task, interval=0)
+
+        debouncer.request()
+        await asyncio.sleep(0.01)
+        debouncer.request()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(2, debouncer.performed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone, timedelta
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, AsyncMock
+
+import scrimbot
+
+ROLE = 7
+
+
+class GuildTests(IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def member(id, *roles):
+        member = MagicMock()
+        member.id = id
+        member.roles = [MagicMock(id=r) for r in roles]
+        member.add_roles = AsyncMock()
+        member.remove_roles = AsyncMock()
+        return member
+
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.dir.name)
+        os.mkdir("data")
+        with open("data/42-settings.json", 'w') as file:
+            json.dump({"server": {"timezone": "UTC", "timeout_role": ROLE}}, file)
+
+        self.members = {1: self.member(1, ROLE), 2: self.member(2)}
+        self.role = MagicMock(id=ROLE)
+        self.role.members = [self.members[1]]
+        self.dc_guild = MagicMock()
+        self.dc_guild.channels = []
+        self.dc_guild.roles = [self.role]
+        self.dc_guild.get_role.side_effect = lambda r: self.role if r == ROLE else None
+        self.dc_guild.get_member.side_effect = self.members.get
+
+        loop = asyncio.get_running_loop()
+        self.bot = MagicMock()
+        self.bot.storage = "json"
+        self.bot.loop = loop
+        self.bot.scheduler = scrimbot.Scheduler(loop.create_task)
+        self.bot.timeout_roles = {}
+        self.bot.get_guild.return_value = self.dc_guild
+
+    async def asyncTearDown(self):
+        os.chdir(self.cwd)
+        self.dir.cleanup()
+
+    def create_guild(self, *timeouts: int) -> scrimbot.Guild:
+        timeout = (datetime.now(timezone.utc) + timedelta(hours=1)).timestamp()
+        with open("data/42-timeouts.json", 'w') as file:
+            json.dump([{"user_id": u, "timeout": timeout} for u in timeouts], file)
+        return scrimbot.Guild("42", self.bot)
+
+    async def test_reconcile_ends_timeouts_of_members_without_role(self):
+        guild = self.create_guild(1, 2, 3)
+
+        guild.reconcile_timeouts()
+
+        self.assertIsNotNone(guild.get_user_timeout(1))
+        self.assertIsNone(guild.get_user_timeout(2))
+        # Not in the member cache, left alone instead of fetched
+        self.assertIsNotNone(guild.get_user_timeout(3))
+        self.dc_guild.fetch_member.assert_not_called()
+
+    async def test_reconcile_keeps_timeouts_waiting_for_role(self):
+        guild = self.create_guild()
+        guild.add_user_timeout(2, timedelta(hours=1))
+        await asyncio.sleep(0)
+
+        guild.reconcile_timeouts()
+
+        self.assertIsNotNone(guild.get_user_timeout(2))
+
+    async def test_member_without_role_is_not_on_timeout(self):
+        guild = self.create_guild(1, 2)
+
+        self.assertTrue(guild.is_on_timeout(self.members[1]))
+        self.assertFalse(guild.is_on_timeout(self.members[2]))
+        self.assertIsNone(guild.get_user_timeout(2))
+
+    async def test_new_timeout_counts_before_role_is_applied(self):
+        guild = self.create_guild()
+        guild.add_user_timeout(2, timedelta(hours=1))
+        await asyncio.sleep(0)
+
+        self.assertTrue(guild.is_on_timeout(self.members[2]))
+        self.assertIsNotNone(guild.get_user_timeout(2))
+
+    async def test_timeout_list_shows_role_holders(self):
+        self.role.members = [self.members[1], self.member(3, ROLE)]
+        guild = self.create_guild(1)
+        guild.reconcile_timeouts()
+
+        timeouts = guild.timeout_list()
+
+        self.assertEqual([1, 3], [u for u, _ in timeouts])
+        self.assertGreater(timeouts[0][1], timedelta(minutes=59))
+        # Holding the role without a stored timeout is an indefinite timeout
+        self.assertIsNone(timeouts[1][1])
+
+    async def test_timeout_list_of_user(self):
+        guild = self.create_guild(1)
+        guild.reconcile_timeouts()
+
+        self.assertEqual([1], [u for u, _ in guild.timeout_list(1)])
+        self.assertEqual([], guild.timeout_list(2))
+
+    async def test_timeout_list_follows_member_updates(self):
+        guild = self.create_guild(1)
+        guild.reconcile_timeouts()
+
+        guild.on_member_update(self.members[2], self.member(2, ROLE))
+        self.assertEqual([1, 2], [u for u, _ in guild.timeout_list()])
+
+        guild.on_member_update(self.members[1], self.member(1))
+        self.assertEqual([2], [u for u, _ in guild.timeout_list()])
+        self.assertIsNone(guild.get_user_timeout(1))
+
+    async def test_close_cancels_scheduled_work(self):
+        guild = self.create_guild(1)
+        await guild._timeouts.init()
+        guild.reconcile_timeouts()
+        self.assertEqual(2, self.bot.scheduler.queue_depth)
+
+        guild.close()
+
+        self.assertEqual(0, self.bot.scheduler.queue_depth)
+
+
+if __name__ == '__main__':
+    unittest.main()
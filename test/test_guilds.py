@@ -1,3 +1,6 @@
+import asyncio
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
 
@@ -6,6 +9,7 @@ from asynctest import patch, TestCase
 
 import scrimbot
 from scrimbot import Guild
+from scrimbot.guilds import known_guild_ids
 
 
 class Guilds(TestCase):
@@ -36,6 +40,147 @@ class Guilds(TestCase):
         self.assertIs(guild_one, guild_two)
         guild_class.assert_called_once_with('42', self.BOT)
 
+    @patch("scrimbot.Guild")
+    async def test_concurrent_gets_share_init(self, guild_class):
+        guilds = scrimbot.Guilds(self.BOT)
+        created_guild = MagicMock(Guild)
+        guild_class.return_value = created_guild
+
+        guild_one, guild_two = await asyncio.gather(guilds.get(42), guilds.get(42))
+
+        self.assertIs(guild_one, guild_two)
+        guild_class.assert_called_once_with('42', self.BOT)
+        created_guild.init.assert_called_once()
+
+    @patch("scrimbot.Guilds.INIT_BACKOFF", 0)
+    @patch("scrimbot.Guild")
+    async def test_failed_init_is_retried(self, guild_class):
+        guilds = scrimbot.Guilds(self.BOT)
+        created_guild = MagicMock(Guild)
+        created_guild.init.side_effect = [discord.DiscordException(), None]
+        guild_class.return_value = created_guild
+
+        guild = await guilds.get(42)
+
+        self.assertIs(created_guild, guild)
+        self.assertEqual(2, created_guild.init.call_count)
+
+    @patch("scrimbot.Guilds.INIT_BACKOFF", 0)
+    @patch("scrimbot.Guild")
+    async def test_failed_guild_is_not_cached(self, guild_class):
+        guilds = scrimbot.Guilds(self.BOT)
+        created_guild = MagicMock(Guild)
+        created_guild.init.side_effect = discord.DiscordException()
+        guild_class.return_value = created_guild
+
+        with self.assertRaises(discord.DiscordException):
+            await guilds.get(42)
+
+        created_guild.init.side_effect = None
+        self.assertIs(created_guild, await guilds.get(42))
+        self.assertEqual(2, guild_class.call_count)
+
+    @patch("scrimbot.Guild")
+    async def test_member_update_only_reaches_loaded_guilds_on_role_change(self, guild_class):
+        guilds = scrimbot.Guilds(self.BOT)
+        created_guild = MagicMock(Guild)
+        guild_class.return_value = created_guild
+        before, after = MagicMock(discord.Member), MagicMock(discord.Member)
+        after.guild.id = 42
+        before.get_role.return_value = None
+        after.get_role.return_value = None
+        self.BOT.timeout_roles["42"] = 7
+
+        after.get_role.return_value = MagicMock(discord.Role)
+        guilds.on_member_update(before, after)
+        guild_class.assert_not_called()
+
+        await guilds.get(42)
+        after.get_role.return_value = None
+        guilds.on_member_update(before, after)
+        created_guild.on_member_update.assert_not_called()
+
+        after.get_role.return_value = MagicMock(discord.Role)
+        guilds.on_member_update(before, after)
+        created_guild.on_member_update.assert_called_once_with(before, after)
+
+    @staticmethod
+    def create_guild(init=None):
+        def create(guild_id, bot):
+            guild = MagicMock(Guild)
+            guild.id = guild_id
+            if init is not None:
+                async def init_guild():
+                    await init(guild_id)
+
+                guild.init.side_effect = init_guild
+            return guild
+
+        return create
+
+    @patch("scrimbot.guilds.known_guild_ids", return_value=[str(g) for g in range(1, 7)])
+    @patch("scrimbot.Guild")
+    async def test_warm_up_limits_concurrency(self, guild_class, _):
+        running, peak = 0, 0
+
+        async def init(guild_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        guild_class.side_effect = self.create_guild(init)
+        guilds = scrimbot.Guilds(MagicMock(discord.Bot))
+
+        await guilds.warm_up(concurrency=2)
+
+        self.assertEqual(2, peak)
+        self.assertEqual(6, guild_class.call_count)
+
+    @patch("scrimbot.guilds.known_guild_ids", return_value=["1", "2", "3"])
+    @patch("scrimbot.Guild")
+    async def test_warm_up_skips_guilds_the_bot_left(self, guild_class, _):
+        guild_class.side_effect = self.create_guild()
+        bot = MagicMock(discord.Bot)
+        bot.get_guild.side_effect = lambda guild_id: None if guild_id == 2 else MagicMock(discord.Guild)
+        guilds = scrimbot.Guilds(bot)
+
+        await guilds.warm_up()
+
+        self.assertEqual(["1", "3"], sorted(c.args[0] for c in guild_class.call_args_list))
+
+    @patch("scrimbot.Guilds.INIT_BACKOFF", 0)
+    @patch("scrimbot.guilds.known_guild_ids", return_value=["1", "2", "3"])
+    @patch("scrimbot.Guild")
+    async def test_warm_up_continues_after_failed_guild(self, guild_class, _):
+        initialised = []
+
+        async def init(guild_id):
+            if guild_id == "2":
+                raise discord.DiscordException()
+            initialised.append(guild_id)
+
+        guild_class.side_effect = self.create_guild(init)
+        guilds = scrimbot.Guilds(MagicMock(discord.Bot))
+
+        await guilds.warm_up()
+
+        self.assertEqual(["1", "3"], sorted(initialised))
+        self.assertEqual("3", (await guilds.get(3)).id)
+        self.assertEqual(3, guild_class.call_count)
+
+
+class KnownGuildIdsTests(unittest.TestCase):
+
+    def test_guilds_are_found_from_their_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["1-scrims.json", "2-timeouts.json", "3-log.jsonl", "4-log.json", "5.sqlite3",
+                         "6.sqlite3.tmp", "7-settings.json", "oculus_profiles.json", "8-scrims.json.migrated"]:
+                open(os.path.join(directory, name), 'w').close()
+
+            self.assertEqual(["1", "2", "3", "4", "5"], known_guild_ids(directory))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from scrimbot import Journal
+
+
+class JournalTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.dir.name, "log.jsonl")
+        self.legacy_file = os.path.join(self.dir.name, "log.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def lines(self):
+        with open(self.file, 'r') as file:
+            return [json.loads(line) for line in file]
+
+    def test_append_writes_single_line(self):
+        journal = Journal(self.file)
+
+        journal.append({"id": "a", "text": "one"})
+        journal.append({"id": "b", "text": "two"})
+
+        self.assertEqual([{"id": "a", "text": "one"}, {"id": "b", "text": "two"}], self.lines())
+
+    def test_remove_writes_tombstone(self):
+        journal = Journal(self.file)
+        journal.append({"id": "a"})
+
+        journal.remove(["a"])
+
+        self.assertEqual([{"id": "a"}, {"removed": "a"}], self.lines())
+        self.assertEqual({}, Journal(self.file).entries)
+
+    def test_load_skips_interrupted_line(self):
+        with open(self.file, 'w') as file:
+            file.write('{"id": "a"}\n{"id": "b", "te')
+
+        self.assertEqual({"a": {"id": "a"}}, Journal(self.file).entries)
+
+    def test_append_after_interrupted_line(self):
+        with open(self.file, 'w') as file:
+            file.write('{"id": "a"}\n{"id": "b", "te')
+
+        Journal(self.file).append({"id": "c"})
+
+        self.assertEqual({"a": {"id": "a"}, "c": {"id": "c"}}, Journal(self.file).entries)
+
+    def test_append_after_unterminated_line(self):
+        with open(self.file, 'w') as file:
+            file.write('{"id": "a"}')
+
+        Journal(self.file).append({"id": "c"})
+
+        self.assertEqual([{"id": "a"}, {"id": "c"}], self.lines())
+
+    def test_migrates_legacy_file(self):
+        with open(self.legacy_file, 'w') as file:
+            json.dump([{"id": "a"}, {"id": "b"}], file)
+
+        journal = Journal(self.file, legacy_file=self.legacy_file)
+
+        self.assertEqual({"a": {"id": "a"}, "b": {"id": "b"}}, journal.entries)
+        self.assertEqual([{"id": "a"}, {"id": "b"}], self.lines())
+        self.assertFalse(os.path.exists(self.legacy_file))
+
+    def test_compacts_when_mostly_dead(self):
+        journal = Journal(self.file)
+        for i in range(Journal.COMPACT_MIN + 1):
+            entry = {"id": str(i)}
+            journal.entries[entry["id"]] = entry
+            journal.append(entry)
+
+        removed = [str(i) for i in range(Journal.COMPACT_MIN)]
+        for i in removed:
+            del journal.entries[i]
+        journal.remove(removed)
+
+        self.assertEqual(1, journal.compactions)
+        self.assertEqual([{"id": str(Journal.COMPACT_MIN)}], self.lines())
+
+
+class JournalFlushTests(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.dir.name, "log.jsonl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    async def test_failed_write_stays_dirty(self):
+        journal = Journal(self.file, queue_task=asyncio.get_running_loop().create_task, interval=60)
+        journal.append({"id": "a"})
+
+        with patch("scrimbot.journal.open", side_effect=OSError("disk full"), create=True):
+            with self.assertRaises(OSError):
+                await journal.flush_async()
+
+        self.assertTrue(journal.dirty)
+        # The flush on shutdown writes the batch that failed
+        journal.flush()
+        self.assertFalse(journal.dirty)
+        self.assertEqual({"a": {"id": "a"}}, Journal(self.file).entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+from datetime import datetime, timezone, timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from scrimbot import Log
+
+
+class LogTests(TestCase):
+    NOW = datetime.now(timezone.utc)
+
+    @staticmethod
+    def entry(id, type, user, author=0, days_ago=0, **kwargs):
+        entry = {"id": id, "user": user, "time": (LogTests.NOW - timedelta(days=days_ago)).timestamp(), "text": id,
+                 "author": author, "type": type}
+        entry.update(kwargs)
+        return entry
+
+    def create_log(self, entries=None):
+        self.journal = MagicMock()
+        self.journal.entries = {} if entries is None else {e["id"]: e for e in entries}
+        return Log(self.journal, lambda user: {"name": f"player{user}"})
+
+    def test_counts(self):
+        log = self.create_log([
+            self.entry("a", "warning", 1, author=2, days_ago=10),
+            self.entry("b", "warning", 1, author=2),
+            self.entry("c", "warning", 2, author=1),
+            self.entry("d", "report", 3, author=1, channel=5),
+            self.entry("e", "report", 3, author=1, channel=5, days_ago=2),
+            self.entry("f", "scrim", 1, days_ago=40),
+            self.entry("g", "scrim", 1),
+        ])
+
+        self.assertEqual(2, log.warning_count(1))
+        self.assertEqual(1, log.weekly_warning_count(1))
+        self.assertEqual(1, log.daily_report_count(1))
+        self.assertEqual(2, log.scrim_count(1))
+        self.assertEqual(1, log.scrim_count(1, start_time=self.NOW - timedelta(days=30)))
+        self.assertEqual(0, log.warning_count(42))
+
+    def test_counts_with_entries_out_of_order(self):
+        log = self.create_log([
+            self.entry("a", "warning", 1, days_ago=1),
+            self.entry("b", "warning", 1, days_ago=10),
+            self.entry("c", "warning", 1, days_ago=3),
+        ])
+
+        self.assertEqual(2, log.weekly_warning_count(1))
+        self.assertEqual(1, log.remove(lambda entry: entry["id"] == "c"))
+        self.assertEqual(1, log.weekly_warning_count(1))
+
+    def test_add_updates_counts(self):
+        log = self.create_log()
+
+        log.add_warning(1, 2, "text")
+        log.add_scrim(1, "scrim")
+
+        self.assertEqual(1, log.warning_count(1))
+        self.assertEqual(1, log.weekly_warning_count(1))
+        self.assertEqual(1, log.scrim_count(1))
+        self.assertEqual(2, self.journal.append.call_count)
+
+    def test_remove_updates_counts(self):
+        log = self.create_log([self.entry("a", "warning", 1), self.entry("b", "warning", 1)])
+
+        removed = log.remove(lambda entry: entry["id"] == "a")
+
+        self.assertEqual(1, removed)
+        self.assertEqual(1, log.warning_count(1))
+        self.journal.remove.assert_called_once_with(["a"])
+
+    def test_remove_id(self):
+        log = self.create_log([self.entry("a", "warning", 1), self.entry("b", "warning", 1)])
+
+        self.assertEqual(1, log.remove_id("b"))
+        self.assertEqual(0, log.remove_id("b"))
+        self.assertEqual(1, log.warning_count(1))
+        self.journal.remove.assert_any_call(["b"])
+
+    def test_remove_user(self):
+        log = self.create_log([self.entry(str(i), "scrim", 1) for i in range(10)] +
+                              [self.entry("w", "warning", 1, author=2), self.entry("x", "scrim", 2)])
+        log.print_scrim_top()
+
+        self.assertEqual(11, log.remove_user(1))
+        self.assertEqual(0, log.scrim_count(1))
+        self.assertEqual(0, log.warning_count(1))
+        self.assertEqual(1, log.scrim_count(2))
+        self.assertEqual(["<@2> player2 1"], log.print_scrim_top())
+        self.assertEqual([], log.print_log(2))
+        self.journal.remove.assert_called_once()
+
+    def test_print_log_includes_authored_entries(self):
+        log = self.create_log([
+            self.entry("a", "warning", 1, author=2, days_ago=1),
+            self.entry("b", "warning", 2, author=1),
+            self.entry("c", "note", 1, author=2),
+        ])
+
+        entries = log.print_log(1)
+
+        self.assertEqual(2, len(entries))
+        self.assertIn("got warned", entries[0])
+        self.assertIn("warned <@2>", entries[1])
+
+    def test_print_warning_top(self):
+        log = self.create_log([
+            self.entry("a", "warning", 1, days_ago=10),
+            self.entry("b", "warning", 1, days_ago=10),
+            self.entry("c", "warning", 2),
+        ])
+
+        self.assertEqual(["<@1> 2/0", "<@2> 1/1"], log.print_warning_top())
+        self.assertEqual(["<@2> 1/1", "<@1> 2/0"], log.print_warning_top(recent=True))
+
+    def test_print_scrim_top(self):
+        log = self.create_log([
+            self.entry("a", "scrim", 1),
+            self.entry("b", "scrim", 2),
+            self.entry("c", "scrim", 2),
+        ])
+
+        self.assertEqual(["<@2> player2 2", "<@1> player1 1"], log.print_scrim_top())
+
+    def test_print_scrim_top_period(self):
+        log = self.create_log([
+            self.entry("a", "scrim", 1, days_ago=3),
+            self.entry("b", "scrim", 2, days_ago=10),
+            self.entry("c", "scrim", 2, days_ago=10),
+        ])
+
+        self.assertEqual(["<@1> player1 1", "<@2> player2 0"], log.print_scrim_top(period="Week"))
+
+    def test_top_lists_follow_changes(self):
+        log = self.create_log([self.entry("a", "scrim", 1), self.entry("b", "scrim", 1)])
+        self.assertEqual(["<@1> player1 2"], log.print_scrim_top(period="Week"))
+
+        log.add_scrim(2, "scrim")
+        log.add_scrim(2, "scrim")
+        log.add_scrim(2, "scrim")
+        log.remove(lambda entry: entry["user"] == 1 and entry["id"] == "a")
+
+        self.assertEqual(["<@2> player2 3", "<@1> player1 1"], log.print_scrim_top(period="Week"))
+        self.assertEqual(["<@2> player2 3", "<@1> player1 1"], log.print_scrim_top())
+
+        log.remove(lambda entry: entry["user"] == 1)
+
+        self.assertEqual(["<@2> player2 3"], log.print_scrim_top(period="Week"))
+
+    def test_print_scrim_top_limit_only_fetches_shown_profiles(self):
+        get_user = MagicMock(return_value={})
+        journal = MagicMock()
+        journal.entries = {e["id"]: e for e in [self.entry("a", "scrim", 1), self.entry("b", "scrim", 2),
+                                                 self.entry("c", "scrim", 2)]}
+        log = Log(journal, get_user)
+
+        self.assertEqual(["<@2>  2"], log.print_scrim_top(limit=1))
+        get_user.assert_called_once_with(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, AsyncMock, patch
+
+import scrimbot
+
+
+class OculusProfilesTests(IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def profile(name):
+        return {"name": name, "avatar": f"https://avatar/{name}", "previous_names": ["old"],
+                "profile_url": f"https://profile/{name}"}
+
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.dir.name)
+        os.mkdir("data")
+        with open("data/oculus_profiles.json", 'w') as file:
+            json.dump({str(u): self.profile(f"player{u}") for u in range(1, 4)}, file)
+
+        self.bot = MagicMock()
+        self.bot.loop = asyncio.get_running_loop()
+        self.guilds = MagicMock()
+        with patch("aiohttp.ClientSession") as session:
+            self.session = session.return_value
+            self.profiles = scrimbot.OculusProfiles(self.bot, guilds=self.guilds)
+
+    async def asyncTearDown(self):
+        os.chdir(self.cwd)
+        self.dir.cleanup()
+
+    async def test_repeated_renders_are_cached(self):
+        embed = await self.profiles.get_embed(1, long=False)
+
+        self.assertIs(embed, await self.profiles.get_embed(1, long=False))
+        self.assertIsNot(embed, await self.profiles.get_embed(1, long=True))
+
+    async def test_set_profile_invalidates_embeds(self):
+        response = self.session.get.return_value.__aenter__.return_value
+        response.text = AsyncMock(
+            return_value='<img class="x img" alt="renamed" src="https://avatar" height="1" width="1" />')
+        response.json = AsyncMock(return_value={"player": {"previous_names": []}})
+        user = MagicMock()
+        user.id = 1
+        embed = await self.profiles.get_embed(1, long=False)
+
+        self.assertEqual("Profile set!", await self.profiles.set_profile(user, "https://profile/renamed"))
+
+        renamed = await self.profiles.get_embed(1, long=False)
+        self.assertIsNot(embed, renamed)
+        self.assertEqual("Oculus profile of renamed", renamed.title)
+
+    @patch("scrimbot.OculusProfiles.EMBED_CACHE_SIZE", 2)
+    async def test_least_recently_used_embed_is_evicted(self):
+        one = await self.profiles.get_embed(1, long=False)
+        two = await self.profiles.get_embed(2, long=False)
+        await self.profiles.get_embed(1, long=False)
+
+        await self.profiles.get_embed(3, long=False)
+
+        self.assertIs(one, await self.profiles.get_embed(1, long=False))
+        self.assertIsNot(two, await self.profiles.get_embed(2, long=False))
+
+    async def test_guild_scrim_count_leaves_cache_untouched(self):
+        guild = MagicMock()
+        guild.log.scrim_count.return_value = 5
+        self.guilds.get = AsyncMock(return_value=guild)
+        cached = await self.profiles.get_embed(1, long=True)
+        fields = len(cached.fields)
+
+        embed = await self.profiles.get_embed(1, long=True, guild=42)
+
+        self.assertIsNot(cached, embed)
+        self.assertEqual("Scrims played", embed.fields[-1].name)
+        self.assertEqual(fields, len(cached.fields))
+        self.assertIs(cached, await self.profiles.get_embed(1, long=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import pytz
+
+import scrimbot
+
+
+class PlayerIndexTests(TestCase):
+
+    @staticmethod
+    def scrim_manager(thread, hour, players=(), reserves=()):
+        scrim = scrimbot.Scrim(data={"thread": thread, "time": datetime(2022, 10, 10, hour).timestamp(),
+                                     "players": [{"id": p} for p in players],
+                                     "reserve": [{"id": r} for r in reserves]},
+                               timezone=pytz.UTC, sync=lambda: None)
+        scrim.settings = {"size": 8}
+        scrim_manager = MagicMock()
+        scrim_manager.id = thread
+        scrim_manager.scrim = scrim
+        return scrim_manager
+
+    def test_existing_users_are_indexed(self):
+        index = scrimbot.PlayerIndex()
+        late = self.scrim_manager(1, 18, players=[1, 2])
+        early = self.scrim_manager(2, 9, reserves=[1])
+
+        index.add_scrim(late)
+        index.add_scrim(early)
+
+        self.assertEqual([early, late], index.scrims(1))
+        self.assertEqual([late], index.scrims(2))
+        self.assertEqual([early], index.scrims(1, end=late.scrim.time.timestamp()))
+        self.assertFalse(index.contains(3))
+
+    def test_follows_roster_changes(self):
+        index = scrimbot.PlayerIndex()
+        scrim_manager = self.scrim_manager(1, 12)
+        index.add_scrim(scrim_manager)
+
+        scrim_manager.scrim.add_reserve({"id": 1})
+        scrim_manager.scrim.add_player({"id": 1})
+        self.assertEqual([scrim_manager], index.scrims(1))
+
+        scrim_manager.scrim.remove_player(1)
+        self.assertEqual([], index.scrims(1))
+        self.assertEqual(0, len(index))
+
+    def test_remove_scrim(self):
+        index = scrimbot.PlayerIndex()
+        scrim_manager = self.scrim_manager(1, 12, players=[1], reserves=[2])
+        index.add_scrim(scrim_manager)
+
+        index.remove_scrim(scrim_manager)
+        scrim_manager.scrim.add_player({"id": 3})
+
+        self.assertEqual(0, len(index))
+
+
+if __name__ == '__main__':
+    unittest.main()
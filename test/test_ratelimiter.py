@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock
+
+import scrimbot
+
+
+class TokenBucketTests(unittest.TestCase):
+
+    def test_empty_bucket_has_a_delay(self):
+        bucket = scrimbot.TokenBucket(2, 10.0)
+        bucket.take()
+        bucket.take()
+
+        self.assertLess(bucket.level, 0.01)
+        self.assertAlmostEqual(5.0, bucket.delay(), places=1)
+
+
+class RateLimiterTests(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.limiter = scrimbot.RateLimiter(asyncio.get_running_loop().create_task)
+
+    async def test_work_is_sent(self):
+        send = AsyncMock()
+
+        sent = await self.limiter.submit(1, "message", send)
+
+        self.assertTrue(sent)
+        send.assert_awaited_once()
+        self.assertEqual(1, self.limiter.sent)
+
+    async def test_only_latest_payload_is_sent(self):
+        first, second = AsyncMock(), AsyncMock()
+        await self.limiter.submit(1, "message", AsyncMock(), bucket=(1, 0.05))
+
+        replaced = self.limiter.submit(1, "message", first)
+        latest = self.limiter.submit(1, "message", second)
+
+        self.assertFalse(await replaced)
+        self.assertTrue(await latest)
+        first.assert_not_awaited()
+        second.assert_awaited_once()
+        self.assertEqual(1, self.limiter.replaced)
+
+    async def test_channel_bucket_is_shared(self):
+        sends = [AsyncMock() for _ in range(6)]
+        for i, send in enumerate(sends):
+            self.limiter.submit(1, i, send)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(5, self.limiter.sent)
+        self.assertEqual(1, self.limiter.pending)
+        self.assertLess(self.limiter.channel_levels[1], 0.1)
+
+    async def test_discarded_work_is_not_sent(self):
+        await self.limiter.submit(1, "message", AsyncMock())
+        send = AsyncMock()
+
+        pending = self.limiter.submit(1, "message", send)
+        self.limiter.discard("message")
+
+        self.assertFalse(await pending)
+        send.assert_not_awaited()
+
+    async def test_submit_after_cancelled_waiter(self):
+        await self.limiter.submit(1, "message", AsyncMock(), bucket=(1, 0.05))
+        self.limiter.submit(1, "message", AsyncMock()).cancel()
+
+        send = AsyncMock()
+        sent = await self.limiter.submit(1, "message", send)
+
+        self.assertTrue(sent)
+        send.assert_awaited_once()
+
+    async def test_sending_continues_after_cancelled_waiter(self):
+        release = asyncio.Event()
+        waiter = self.limiter.submit(1, "message", release.wait, bucket=(1, 0.05))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+
+        send = AsyncMock()
+        sent = self.limiter.submit(1, "message", send)
+        release.set()
+
+        self.assertTrue(await asyncio.wait_for(sent, 1))
+        send.assert_awaited_once()
+
+    async def test_failed_work_is_reported(self):
+        sent = await self.limiter.submit(1, "message", AsyncMock(side_effect=RuntimeError))
+
+        self.assertFalse(sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
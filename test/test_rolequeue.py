@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, AsyncMock
+
+import scrimbot
+
+
+class RoleQueueTests(IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def member(*roles):
+        member = MagicMock()
+        member.roles = [MagicMock(id=r) for r in roles]
+        member.add_roles = AsyncMock()
+        member.remove_roles = AsyncMock()
+        return member
+
+    def setUp(self):
+        self.members = {1: self.member(), 2: self.member(7)}
+        self.guild = MagicMock()
+        self.guild.get_member.side_effect = self.members.get
+        self.guild.fetch_member = AsyncMock(return_value=self.member())
+
+    async def test_only_latest_change_is_applied(self):
+        queue = scrimbot.RoleQueue(lambda: self.guild, asyncio.get_running_loop().create_task, interval=0)
+
+        queue.remove(1, 7)
+        queue.add(1, 7, reason="timeout")
+        self.assertEqual(1, len(queue))
+        await asyncio.sleep(0.01)
+
+        self.members[1].add_roles.assert_called_once()
+        self.members[1].remove_roles.assert_not_called()
+        self.assertEqual(1, queue.applied)
+
+    async def test_change_is_pending_until_applied(self):
+        queue = scrimbot.RoleQueue(lambda: self.guild, asyncio.get_running_loop().create_task, interval=0)
+        release = asyncio.Event()
+
+        async def add_roles(*args, **kwargs):
+            await release.wait()
+
+        self.members[1].add_roles.side_effect = add_roles
+
+        queue.add(1, 7)
+        await asyncio.sleep(0.01)
+        self.assertTrue(queue.pending(1, 7))
+
+        release.set()
+        await asyncio.sleep(0.01)
+        self.assertIsNone(queue.pending(1, 7))
+
+    async def test_members_in_the_wanted_state_are_skipped(self):
+        queue = scrimbot.RoleQueue(lambda: self.guild, asyncio.get_running_loop().create_task, interval=0)
+
+        queue.add(2, 7)
+        await asyncio.sleep(0.01)
+
+        self.members[2].add_roles.assert_not_called()
+        self.assertEqual(1, queue.skipped)
+
+    async def test_uncached_members_are_fetched(self):
+        queue = scrimbot.RoleQueue(lambda: self.guild, asyncio.get_running_loop().create_task, interval=0)
+
+        queue.add(3, 7)
+        await asyncio.sleep(0.01)
+
+        self.guild.fetch_member.assert_called_once_with(3)
+        self.assertEqual(1, queue.applied)
+
+    async def test_changes_are_spaced_out(self):
+        queue = scrimbot.RoleQueue(lambda: self.guild, asyncio.get_running_loop().create_task, interval=60)
+
+        queue.add(1, 7)
+        queue.add(3, 7)
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(1, queue.applied)
+        self.assertEqual(1, len(queue))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import pytz
+
+import scrimbot
+
+
+class RosterTests(TestCase):
+
+    def test_index_follows_list(self):
+        members = [{"id": 1}, {"id": 2}]
+        roster = scrimbot.Roster(members)
+
+        roster.add({"id": 3})
+        self.assertEqual({"id": 2}, roster.remove(2))
+        self.assertIsNone(roster.remove(2))
+
+        self.assertEqual([{"id": 1}, {"id": 3}], members)
+        self.assertIn(3, roster)
+        self.assertNotIn(2, roster)
+
+    def test_next_auto_in_signup_order(self):
+        roster = scrimbot.Roster([{"id": 1}, {"id": 2, "auto": True}, {"id": 3}])
+
+        roster.set_auto(1, True)
+        roster.set_auto(3, True)
+        self.assertEqual(1, roster.next_auto()["id"])
+
+        roster.set_auto(1, False)
+        self.assertEqual(2, roster.next_auto()["id"])
+
+        roster.remove(2)
+        self.assertEqual(3, roster.next_auto()["id"])
+        self.assertFalse(roster.set_auto(4, True))
+
+
+class ScrimRosterTests(TestCase):
+
+    def scrim(self, players=(), reserves=(), size=2):
+        self.sync = MagicMock()
+        scrim = scrimbot.Scrim(data={"thread": 1, "time": datetime(2022, 10, 10, 14).timestamp(),
+                                     "players": [{"id": p} for p in players],
+                                     "reserve": [{"id": r} for r in reserves]},
+                               timezone=pytz.UTC, sync=self.sync)
+        scrim.settings = {"size": size}
+        return scrim
+
+    def test_one_sync_per_transition(self):
+        scrim = self.scrim(reserves=[1])
+
+        scrim.add_player({"id": 1})
+        self.assertEqual(1, self.sync.call_count)
+        self.assertEqual([{"id": 1}], scrim.data["players"])
+        self.assertEqual([], scrim.data["reserve"])
+
+        scrim.add_reserve({"id": 1})
+        self.assertEqual(2, self.sync.call_count)
+        self.assertTrue(scrim.contains_reserve(1))
+        self.assertFalse(scrim.contains_player(1))
+
+        scrim.remove_reserve(1)
+        scrim.remove_reserve(1)
+        self.assertEqual(3, self.sync.call_count)
+
+    def test_leaving_player_is_replaced_by_first_auto_join_reserve(self):
+        scrim = self.scrim(players=[1, 2], reserves=[3, 4])
+        scrim.set_auto_join(4)
+        scrim.set_auto_join(3)
+        self.sync.reset_mock()
+
+        added = scrim.remove_player(1)
+
+        self.assertEqual({"id": 3}, added)
+        self.assertEqual([{"id": 2}, {"id": 3}], scrim.data["players"])
+        self.assertEqual([{"id": 4, "auto": True}], scrim.data["reserve"])
+        self.sync.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
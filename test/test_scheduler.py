@@ -0,0 +1,72 @@
+import asyncio
+import time
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from scrimbot import Scheduler
+
+
+class SchedulerTests(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.fired = []
+
+    def callback(self, name):
+        return lambda: self.fired.append(name)
+
+    async def test_fires_in_deadline_order(self):
+        scheduler = Scheduler(asyncio.get_running_loop().create_task)
+        now = time.time()
+
+        scheduler.schedule(now + 0.04, self.callback("late"))
+        scheduler.schedule(now + 0.02, self.callback("early"))
+        scheduler.schedule(now - 10, self.callback("overdue"))
+        self.assertEqual(3, scheduler.queue_depth)
+        self.assertEqual(now - 10, scheduler.next_deadline)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(["overdue", "early", "late"], self.fired)
+        self.assertEqual(0, scheduler.queue_depth)
+        self.assertIsNone(scheduler.next_deadline)
+
+    async def test_cancel_and_reschedule(self):
+        scheduler = Scheduler(asyncio.get_running_loop().create_task)
+        now = time.time()
+
+        cancelled = scheduler.schedule(now + 0.02, self.callback("cancelled"))
+        moved = scheduler.schedule(now + 60, self.callback("moved"))
+        scheduler.cancel(cancelled)
+        scheduler.reschedule(moved, now + 0.01)
+
+        self.assertEqual(1, scheduler.queue_depth)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(["moved"], self.fired)
+        self.assertEqual(1, scheduler.fired)
+
+    async def test_earlier_event_wakes_up_the_scheduler(self):
+        scheduler = Scheduler(asyncio.get_running_loop().create_task)
+
+        scheduler.schedule(time.time() + 60, self.callback("later"))
+        await asyncio.sleep(0.01)
+        scheduler.schedule(time.time() + 0.01, self.callback("sooner"))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(["sooner"], self.fired)
+        self.assertEqual(1, scheduler.queue_depth)
+
+    async def test_coroutines_are_queued(self):
+        scheduler = Scheduler(asyncio.get_running_loop().create_task)
+
+        async def coroutine():
+            self.fired.append("coroutine")
+
+        scheduler.schedule(time.time(), coroutine)
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(["coroutine"], self.fired)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone, timedelta
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, AsyncMock
+
+import discord
+
+import scrimbot
+from scrimbot.scrimmanager import fingerprint
+
+
+class FingerprintTests(TestCase):
+
+    @staticmethod
+    def embed(players):
+        embed = discord.Embed(title="Scrim", type="rich", colour=discord.Colour.green())
+        embed.add_field(name="Players", value=players)
+        return embed
+
+    def test_same_render_same_fingerprint(self):
+        self.assertEqual(fingerprint({"content": "", "embeds": [self.embed("a")], "view": None}),
+                         fingerprint({"content": "", "embeds": [self.embed("a")], "view": None}))
+
+    def test_changes_are_detected(self):
+        base = fingerprint({"content": "", "embeds": [self.embed("a")], "view": None})
+
+        self.assertNotEqual(base, fingerprint({"content": "", "embeds": [self.embed("b")], "view": None}))
+        self.assertNotEqual(base, fingerprint({"content": "x", "embeds": [self.embed("a")], "view": None}))
+
+
+class ScrimManagerTests(IsolatedAsyncioTestCase):
+
+    async def test_close_cancels_scheduled_start(self):
+        bot = MagicMock()
+        bot.scheduler = scrimbot.Scheduler(asyncio.get_running_loop().create_task)
+        thread = MagicMock()
+        thread.fetch_message = AsyncMock()
+        thread.parent.fetch_message = AsyncMock()
+        bot.fetch_channel = AsyncMock(return_value=thread)
+        scrim = MagicMock()
+        scrim.time = datetime.now(timezone.utc) + timedelta(hours=1)
+        scrim.timezone = timezone.utc
+        scrim.settings = {}
+        manager = scrimbot.ScrimManager(scrim=scrim, update_broadcasts=MagicMock(),
+                                        queue_task=lambda coro: coro.close(), remove=MagicMock(), bot=bot,
+                                        timeout_check=MagicMock())
+        await manager.init()
+        self.assertEqual(1, bot.scheduler.queue_depth)
+
+        manager.close()
+
+        self.assertEqual(0, bot.scheduler.queue_depth)
+
+
+if __name__ == '__main__':
+    unittest.main()
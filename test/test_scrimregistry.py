@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import scrimbot
+
+
+class ScrimRegistryTests(TestCase):
+
+    @staticmethod
+    def scrim_manager(thread, channel=1, broadcast=0, hour=12):
+        scrim_manager = MagicMock()
+        scrim_manager.id = thread
+        scrim_manager.broadcast = broadcast
+        scrim_manager.scrim.scrim_channel = channel
+        scrim_manager.scrim.data = {"thread": thread}
+        scrim_manager.scrim.time = datetime(2022, 10, 10, hour, tzinfo=timezone.utc)
+        return scrim_manager
+
+    def test_add_and_get(self):
+        data = []
+        registry = scrimbot.ScrimRegistry(data)
+        one = self.scrim_manager(1, channel=10, broadcast=20)
+        two = self.scrim_manager(2, channel=11, broadcast=20)
+
+        registry.add(one)
+        registry.add(two)
+
+        self.assertIs(one, registry.get(1))
+        self.assertIsNone(registry.get(3))
+        self.assertEqual([one], registry.in_channel(10))
+        self.assertEqual([one, two], registry.for_broadcast(20))
+        self.assertEqual([], registry.for_broadcast(21))
+        self.assertEqual([{"thread": 1}, {"thread": 2}], data)
+        self.assertEqual(2, len(registry))
+
+    def test_loaded_data_is_not_duplicated(self):
+        data = [{"thread": 1}]
+        registry = scrimbot.ScrimRegistry(data)
+        one = self.scrim_manager(1)
+        one.scrim.data = data[0]
+
+        registry.add(one)
+
+        self.assertEqual([{"thread": 1}], data)
+
+    def test_remove(self):
+        data = []
+        registry = scrimbot.ScrimRegistry(data)
+        scrim_managers = [self.scrim_manager(i, channel=i % 2) for i in range(5)]
+        for scrim_manager in scrim_managers:
+            registry.add(scrim_manager)
+
+        self.assertTrue(registry.remove(scrim_managers[1]))
+        self.assertFalse(registry.remove(scrim_managers[1]))
+        self.assertTrue(registry.remove(scrim_managers[3]))
+
+        self.assertEqual([0, 2, 4], sorted(d["thread"] for d in data))
+        self.assertEqual([], registry.in_channel(1))
+        self.assertEqual([scrim_managers[0], scrim_managers[2], scrim_managers[4]], list(registry))
+        self.assertNotIn(scrim_managers[1], registry)
+
+        self.assertTrue(registry.remove(scrim_managers[0]))
+        self.assertEqual([2, 4], sorted(d["thread"] for d in data))
+
+    def test_time_windows(self):
+        registry = scrimbot.ScrimRegistry([])
+        late = self.scrim_manager(1, channel=10, broadcast=20, hour=18)
+        early = self.scrim_manager(2, channel=10, broadcast=20, hour=9)
+        other = self.scrim_manager(3, channel=11, hour=10)
+        for scrim_manager in [late, early, other]:
+            registry.add(scrim_manager)
+
+        nine = datetime(2022, 10, 10, 9, tzinfo=timezone.utc).timestamp()
+        self.assertEqual([early, other, late], registry.between())
+        self.assertEqual([early], registry.in_channel(10, nine - 3600, nine + 3600))
+        self.assertEqual([], registry.in_channel(11, nine - 3600, nine + 3600))
+        self.assertEqual([late], registry.for_broadcast(20, start=nine))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -106,6 +106,24 @@ class SettingsTests(TestCase):
 
         self.assertDictEqual(channel, {'broadcast_channel': 40, 'ping_cooldown': 5, 'prefix': 'Mixed Scrim'})
 
+    def test_resolved_settings_are_cached(self):
+        store = MagicMock()
+        store.data = {"server": {"timezone": "Atlantic/Madeira"}, 'channel': {'20': {'broadcast_channel': 1}}}
+        settings = self.create_settings(store)
+
+        self.assertIs(settings.server, settings.server)
+        self.assertIs(settings.channel(20), settings.channels['20'])
+
+    def test_replace_invalidates_cache(self):
+        store = MagicMock()
+        store.data = {"server": {"timezone": "Atlantic/Madeira"}}
+        settings = self.create_settings(store)
+        self.assertEqual('Atlantic/Madeira', settings.server['timezone'])
+
+        settings.replace({"server": {"timezone": "UTC"}})
+
+        self.assertEqual('UTC', settings.server['timezone'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from scrimbot import Store
+
+
+class StoreTests(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.dir.name, "store.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def read(self):
+        with open(self.file, 'r') as file:
+            return json.load(file)
+
+    async def test_burst_is_written_once(self):
+        store = Store[list](self.file, [], queue_task=asyncio.get_running_loop().create_task, interval=0.01)
+
+        for i in range(5):
+            store.data.append(i)
+            store.mark_dirty()
+
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(1, store.writes)
+        self.assertEqual(4, store.coalesced)
+        self.assertEqual([0, 1, 2, 3, 4], self.read())
+
+    async def test_flush_writes_pending_changes(self):
+        store = Store[list](self.file, [], queue_task=asyncio.get_running_loop().create_task, interval=60)
+
+        store.data.append(1)
+        store.mark_dirty()
+        store.flush()
+
+        self.assertFalse(store.dirty)
+        self.assertEqual([1], self.read())
+
+    async def test_flush_without_changes_does_nothing(self):
+        store = Store[list](self.file, [], queue_task=asyncio.get_running_loop().create_task)
+
+        store.flush()
+
+        self.assertEqual(0, store.writes)
+        self.assertFalse(os.path.exists(self.file))
+
+    async def test_flush_async_replaces_file(self):
+        with open(self.file, 'w') as file:
+            file.write("[0]")
+        store = Store[list](self.file, [], queue_task=asyncio.get_running_loop().create_task, interval=60)
+
+        store.data.append(1)
+        store.mark_dirty()
+        await store.flush_async()
+
+        self.assertEqual([0, 1], self.read())
+        self.assertEqual(["store.json"], os.listdir(self.dir.name))
+
+    def test_writes_immediately_without_queue(self):
+        store = Store[list](self.file, [])
+
+        store.data.append(1)
+        store.mark_dirty()
+
+        self.assertEqual(1, store.writes)
+        self.assertEqual([1], self.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest import TestCase
+
+from scrimbot.timeindex import TimeIndex
+
+
+class TimeIndexTests(TestCase):
+
+    def test_between(self):
+        index = TimeIndex()
+        index.add(1, 30, "c")
+        index.add(2, 10, "a")
+        index.add(3, 20, "b")
+        index.add(4, 20, "b2")
+
+        self.assertEqual(["a", "b", "b2", "c"], index.between())
+        self.assertEqual(["b", "b2"], index.between(10, 30))
+        self.assertEqual(["b", "b2", "c"], index.between(start=10))
+        self.assertEqual([], index.between(20, 20))
+
+    def test_remove_and_move(self):
+        index = TimeIndex()
+        index.add(1, 10, "a")
+        index.add(2, 20, "b")
+
+        self.assertEqual("a", index.remove(1))
+        self.assertIsNone(index.remove(1))
+        index.add(2, 5, "b")
+
+        self.assertEqual(["b"], list(index))
+        self.assertEqual(1, len(index))
+        self.assertNotIn(1, index)
+
+
+if __name__ == '__main__':
+    unittest.main()
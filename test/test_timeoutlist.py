@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone, timedelta
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, AsyncMock
+
+import scrimbot
+
+
+class TimeoutListTests(IsolatedAsyncioTestCase):
+
+    def create_list(self, data):
+        loop = asyncio.get_running_loop()
+        self.guild = MagicMock()
+        self.guild.bot.loop = loop
+        self.guild.bot.scheduler = scrimbot.Scheduler(loop.create_task)
+        self.guild.bot.player_index.scrims.return_value = []
+        self.guild.add_timeout_role = AsyncMock()
+        self.guild.remove_timeout_role = AsyncMock()
+        self.store = MagicMock()
+        self.store.data = data
+        return scrimbot.TimeoutList(self.guild, self.store)
+
+    @staticmethod
+    def timestamp(**kwargs):
+        return (datetime.now(timezone.utc) + timedelta(**kwargs)).timestamp()
+
+    async def test_loaded_timeouts(self):
+        timeouts = self.create_list([{"user_id": 1, "timeout": self.timestamp(hours=1)},
+                                     {"user_id": 2, "timeout": self.timestamp(hours=2)}])
+        await timeouts.init()
+
+        self.assertTrue(timeouts.contains_user(1))
+        self.assertFalse(timeouts.contains_user(3))
+        self.assertEqual(1, self.guild.bot.scheduler.queue_depth)
+        self.assertAlmostEqual(self.timestamp(hours=1), self.guild.bot.scheduler.next_deadline, delta=1)
+
+    async def test_duplicate_users_are_dropped(self):
+        timeouts = self.create_list([{"user_id": 1, "timeout": self.timestamp(hours=1)},
+                                     {"user_id": 1, "timeout": self.timestamp(hours=2)}])
+
+        self.assertEqual(1, len(self.store.data))
+        self.assertGreater(timeouts.time_remaining(1), timedelta(hours=1))
+
+    async def test_add_and_remove(self):
+        timeouts = self.create_list([{"user_id": 1, "timeout": self.timestamp(hours=1)}])
+        await timeouts.init()
+
+        timeouts.add_user(2, timedelta(minutes=5), "reason")
+        timeouts.add_user(3, timedelta(hours=5), "reason")
+        self.assertAlmostEqual(self.timestamp(minutes=5), self.guild.bot.scheduler.next_deadline, delta=1)
+
+        timeouts.remove_user(2)
+        self.assertEqual([1, 3], sorted(u["user_id"] for u in self.store.data))
+        self.assertAlmostEqual(self.timestamp(hours=1), self.guild.bot.scheduler.next_deadline, delta=1)
+        self.assertRaises(ValueError, timeouts.remove_user, 2)
+
+    async def test_expired_users_are_removed(self):
+        timeouts = self.create_list([{"user_id": 1, "timeout": self.timestamp(seconds=-1)},
+                                     {"user_id": 2, "timeout": self.timestamp(hours=1)}])
+        await timeouts.init()
+        await asyncio.sleep(0.01)
+
+        self.assertFalse(timeouts.contains_user(1))
+        self.assertEqual([{"user_id": 2, "timeout": self.store.data[0]["timeout"]}], self.store.data)
+        self.guild.remove_timeout_role.assert_called_once_with(1, reason=None)
+        self.assertEqual(1, self.guild.bot.scheduler.queue_depth)
+
+
+if __name__ == '__main__':
+    unittest.main()